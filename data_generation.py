@@ -9,6 +9,38 @@ RESULTS_DIR = "data/results"
 os.makedirs(APPLICATIONS_DIR, exist_ok=True)
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
+# Output files, resolved once; application N is written to f"{APPLICATION_FILE_PREFIX}{N}.json"
+APPLICATIONS_FILE = os.path.join(APPLICATIONS_DIR, "applications.jsonl")
+HIDDEN_APPROVALS_FILE = os.path.join(APPLICATIONS_DIR, "hidden_approvals.json")
+APPLICATION_FILE_PREFIX = os.path.join(APPLICATIONS_DIR, "application_")
+
+# Readers load applications.jsonl; the individual application_N.json files are
+# only written for tools that still expect them
+WRITE_INDIVIDUAL_FILES = os.getenv("WRITE_INDIVIDUAL_FILES", "1") not in ("", "0")
+
+# Value ranges for random applications as (low, high, tier), built once rather than per application
+CREDIT_SEGMENTS = (
+    (500, 600, "Very Poor"),
+    (601, 650, "Poor"),
+    (651, 700, "Good"),
+    (701, 770, "Very Good"),
+    (771, 850, "Excellent")
+)
+INCOME_SEGMENTS = (
+    (20000, 40000, "Low"),
+    (40001, 70000, "Medium"),
+    (70001, 100000, "High"),
+    (100001, 180000, "Very High")
+)
+DEBT_SEGMENTS = (
+    (0.1, 0.2, "Very Low"),
+    (0.21, 0.35, "Low"),
+    (0.36, 0.6, "Medium"),
+    (0.61, 0.8, "High")
+)
+PAYMENT_OPTIONS = ("Excellent", "Good", "Fair", "Poor")
+EMPLOYMENT_OPTIONS = ("Employed", "Self-employed", "Part-time", "Unemployed", "Contract")
+
 def generate_application(approval_type=None):
     """Generate application with nuanced patterns based on approval_type"""
     if approval_type == "approve_high_score":
@@ -134,42 +166,20 @@ def generate_application(approval_type=None):
     
     else:
         # Random application with slight variation
-        credit_segments = [
-            (500, 600, "Very Poor"),
-            (601, 650, "Poor"),
-            (651, 700, "Good"),
-            (701, 770, "Very Good"),
-            (771, 850, "Excellent")
-        ]
-        segment = random.choice(credit_segments)
+        segment = random.choice(CREDIT_SEGMENTS)
         credit_score = random.randint(segment[0], segment[1])
         credit_tier = segment[2]
         
-        income_segments = [
-            (20000, 40000, "Low"),
-            (40001, 70000, "Medium"),
-            (70001, 100000, "High"),
-            (100001, 180000, "Very High")
-        ]
-        income_segment = random.choice(income_segments)
+        income_segment = random.choice(INCOME_SEGMENTS)
         annual_income = random.randint(income_segment[0], income_segment[1])
         income_tier = income_segment[2]
         
-        debt_segments = [
-            (0.1, 0.2, "Very Low"),
-            (0.21, 0.35, "Low"),
-            (0.36, 0.6, "Medium"),
-            (0.61, 0.8, "High")
-        ]
-        debt_segment = random.choice(debt_segments)
+        debt_segment = random.choice(DEBT_SEGMENTS)
         debt_ratio = random.uniform(debt_segment[0], debt_segment[1])
         debt_tier = debt_segment[2]
         
-        payment_options = ["Excellent", "Good", "Fair", "Poor"]
-        payment_history = random.choice(payment_options)
-        
-        employment_options = ["Employed", "Self-employed", "Part-time", "Unemployed", "Contract"]
-        employment_status = random.choice(employment_options)
+        payment_history = random.choice(PAYMENT_OPTIONS)
+        employment_status = random.choice(EMPLOYMENT_OPTIONS)
     
     existing_debt = int(annual_income * debt_ratio)
     
@@ -267,21 +277,22 @@ def should_approve(app):
     # Decline if not satisfying any of above rules
     return False
 
+def write_individual_files(applications):
+    """Save each application to its own application_N.json file"""
+    for i, application in enumerate(applications, start=1):
+        with open(f"{APPLICATION_FILE_PREFIX}{i}.json", 'w') as f:
+            json.dump(application, f, separators=(',', ':'))
+
 def generate_new_applications():
     """Generate 20 applications with nuanced approval patterns"""
     application_count = 20
     
-    # Clear previous files
-    for existing_file in os.listdir(APPLICATIONS_DIR):
-        file_path = os.path.join(APPLICATIONS_DIR, existing_file)
-        if os.path.isfile(file_path):
-            os.remove(file_path)
-    
-    # Clear previous results
-    for existing_file in os.listdir(RESULTS_DIR):
-        file_path = os.path.join(RESULTS_DIR, existing_file)
-        if os.path.isfile(file_path):
-            os.remove(file_path)
+    # Clear previous files and results; scandir entries know their type without another stat
+    for directory in (APPLICATIONS_DIR, RESULTS_DIR):
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    os.remove(entry.path)
     
     # Define application types to generate with adjusted counts for 20 applications
     application_types = [
@@ -323,14 +334,18 @@ def generate_new_applications():
         
         applications.append(application)
         approval_decisions[str(i)] = is_approved
-        
-        # Save application to file
-        with open(os.path.join(APPLICATIONS_DIR, f"application_{i}.json"), 'w') as f:
-            json.dump(application, f, indent=2)
+    
+    # Save all applications to a single JSON Lines file (line N is application N)
+    # so readers can load the whole set with one open instead of one per file
+    with open(APPLICATIONS_FILE, 'w') as f:
+        f.writelines(json.dumps(application, separators=(',', ':')) + "\n" for application in applications)
+    
+    if WRITE_INDIVIDUAL_FILES:
+        write_individual_files(applications)
     
     # Save hidden approvals
-    with open(os.path.join(APPLICATIONS_DIR, "hidden_approvals.json"), 'w') as f:
-        json.dump(approval_decisions, f, indent=2)
+    with open(HIDDEN_APPROVALS_FILE, 'w') as f:
+        json.dump(approval_decisions, f, separators=(',', ':'))
     
     print(f"Generated {len(applications)} applications with nuanced patterns")
     approved_count = sum(1 for v in approval_decisions.values() if v)
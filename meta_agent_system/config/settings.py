@@ -20,6 +20,18 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 MAX_ITERATIONS = int(os.getenv("MAX_ITERATIONS", "20"))
 DEFAULT_TASK_PRIORITY = 5
 
+# LLM settings
+# Reuse earlier responses to identical prompts instead of calling the API again
+LLM_CACHE = os.getenv("META_AGENT_LLM_CACHE", "") not in ("", "0")
+# Requests in flight at once across all threads, and retries (with backoff) on rate limits and server errors
+LLM_MAX_CONCURRENCY = int(os.getenv("META_AGENT_LLM_CONCURRENCY", "8"))
+LLM_MAX_RETRIES = int(os.getenv("META_AGENT_LLM_RETRIES", "5"))
+# Optional cheaper model for the expertise recommender; defaults to DEFAULT_MODEL
+RECOMMENDER_MODEL = os.getenv("META_AGENT_RECOMMENDER_MODEL") or None
+
+# Summary settings
+SKIP_PLOT = os.getenv("META_AGENT_SKIP_PLOT", "") not in ("", "0")
+
 # Task types
 TASK_TYPES = {
     "task_decomposition": "Breaking down a complex task into smaller, manageable subtasks",
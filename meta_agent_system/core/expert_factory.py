@@ -2,6 +2,7 @@ from typing import Dict, Any, List, Optional
 from meta_agent_system.core.expert_agent import ExpertAgent
 from meta_agent_system.llm.openai_client import OpenAIClient
 from meta_agent_system.utils.logger import get_logger
+from meta_agent_system.utils.helpers import json_dumps, find_json_object
 import json
 import os
 
@@ -58,7 +59,7 @@ class ExpertFactory:
             prompt = f"""
 Task Description: {task_description}
 
-Task Data: {json.dumps(task_data, indent=2)}
+Task Data: {json_dumps(task_data, indent=False)}
 
 Please analyze this task and provide a solution based on your expertise.
 """
@@ -73,10 +74,9 @@ Please analyze this task and provide a solution based on your expertise.
             # Try to parse structured output if available
             try:
                 # Check if the response contains JSON
-                import re
-                json_match = re.search(r'\{[\s\S]*\}', llm_response)
-                if json_match:
-                    result = json.loads(json_match.group(0))
+                json_str = find_json_object(llm_response)
+                if json_str:
+                    result = json.loads(json_str)
                     return result
             except:
                 # If parsing fails, return the raw response
@@ -213,9 +213,9 @@ The system prompt should be comprehensive, instructive, and set clear expectatio
             prompt = f"""
 Task: {task_description}
 
-Context: {json.dumps(context, indent=2)}
+Context: {json_dumps(context, indent=False)}
 
-Data: {json.dumps(task_data, indent=2)}
+Data: {json_dumps(task_data, indent=False)}
 
 Based on your specialized expertise as {name}, please analyze this task and provide your recommendations.
 """
@@ -256,10 +256,9 @@ Based on your specialized expertise as {name}, please analyze this task and prov
         """Extract structured recommendations from text response"""
         try:
             # Look for JSON pattern in the text
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', text)
-            if json_match:
-                return json.loads(json_match.group(0))
+            json_str = find_json_object(text)
+            if json_str:
+                return json.loads(json_str)
             
             # If no JSON found, create a simple structure
             recommendations = []
@@ -3,14 +3,18 @@ from meta_agent_system.core.expert_agent import ExpertAgent
 from meta_agent_system.core.expert_factory import ExpertFactory
 from meta_agent_system.llm.openai_client import OpenAIClient
 from meta_agent_system.utils.logger import get_logger
+from meta_agent_system.utils.helpers import save_json
 from meta_agent_system.config.settings import RESULTS_DIR
 import os
-import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style
 
 logger = get_logger(__name__)
 
+# Maximum number of experts asked for insights at the same time
+INSIGHT_MAX_WORKERS = 4
+
 class ExpertManager:
     """
     Manages the creation and coordination of dynamic expert agents.
@@ -82,8 +86,8 @@ class ExpertManager:
         # Just log the count at INFO level
         logger.info(f"Gathering insights from {len(self.dynamic_experts)} dynamic experts")
         
-        insights = []
-        for expert in self.dynamic_experts:
+        def request_insight(expert):
+            """Ask a single expert for its insight, or None if it fails"""
             # Basic info at INFO level
             logger.info(f"Requesting insight from {expert.name}")
             
@@ -109,18 +113,23 @@ class ExpertManager:
                 result = expert.execute(task_data)
                 
                 if result.get("status") == "success":
-                    insight = {
+                    logger.info(f"Received insight from {expert.name}")
+                    logger.debug(f"Insight content from {expert.name}: {result.get('result', {})}")
+                    return {
                         "expert": expert.name,
                         "timestamp": int(time.time()),
                         "insight": result.get("result", {})
                     }
-                    insights.append(insight)
-                    logger.info(f"Received insight from {expert.name}")
-                    logger.debug(f"Insight content from {expert.name}: {result.get('result', {})}")
-                else:
-                    logger.warning(f"Expert {expert.name} failed to provide insight: {result.get('message', 'Unknown error')}")
+                logger.warning(f"Expert {expert.name} failed to provide insight: {result.get('message', 'Unknown error')}")
             except Exception as e:
                 logger.error(f"Error getting insight from {expert.name}: {str(e)}")
+            return None
+        
+        # The experts are independent, so their LLM requests can overlap;
+        # map keeps the insights in expert order
+        with ThreadPoolExecutor(max_workers=INSIGHT_MAX_WORKERS) as executor:
+            results = executor.map(request_insight, self.dynamic_experts)
+            insights = [insight for insight in results if insight is not None]
         
         # Save all insights to file
         if insights:
@@ -131,8 +140,7 @@ class ExpertManager:
     def _save_expert_insights(self, insights: List[Dict[str, Any]], iteration: int):
         """Save expert insights to a file"""
         insights_file = os.path.join(RESULTS_DIR, f"expert_insights_iteration_{iteration}.json")
-        with open(insights_file, 'w') as f:
-            json.dump(insights, f, indent=2)
+        save_json(insights, insights_file)
         logger.info(f"Saved {len(insights)} expert insights to {insights_file}")
     
     def record_expert_contribution(self, 
@@ -165,8 +173,7 @@ class ExpertManager:
         
         # Save to file
         contribution_file = os.path.join(RESULTS_DIR, f"expert_contributions_iteration_{iteration}.json")
-        with open(contribution_file, 'w') as f:
-            json.dump(contribution, f, indent=2)
+        save_json(contribution, contribution_file)
             
         logger.info(f"Recorded expert contributions for iteration {iteration} with {improvement:.2f}% improvement")
         
@@ -0,0 +1,89 @@
+import os
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Optional
+from meta_agent_system.utils.helpers import load_jsonl, json_dumps, ensure_directory_exists
+from meta_agent_system.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass
+class MemoryEntry:
+    """
+    A remembered expert output and a record of whether it helped.
+    
+    Attributes:
+        index: Key the entry is stored under, such as a hash of the input schema
+        content: Most recent output that was followed by an improvement
+        candidate: Latest output, waiting for the next outcome to be scored
+        candidate_score: Score (e.g. accuracy) at the time the candidate was recorded
+        monitoring: How often the entry was scored ("freq"), helped ("pass") or didn't ("fault")
+    """
+    index: str
+    content: Optional[str] = None
+    candidate: Optional[str] = None
+    candidate_score: Optional[float] = None
+    monitoring: Dict[str, int] = field(default_factory=lambda: {"freq": 0, "pass": 0, "fault": 0})
+    
+    def pass_rate(self) -> float:
+        """Get the fraction of scored outcomes where this entry helped"""
+        if not self.monitoring["freq"]:
+            return 0.0
+        return self.monitoring["pass"] / self.monitoring["freq"]
+
+class ExpertMemory:
+    """
+    Persistent memory of expert outputs, stored as one JSON line per entry.
+    
+    An expert records each output as a candidate together with the current score.
+    The next time it runs, the candidate is scored against the new score: if it
+    improved, the candidate becomes the entry's content and counts as a pass.
+    """
+    
+    def __init__(self, filepath: str):
+        """Load existing entries from filepath, if it exists"""
+        self.filepath = filepath
+        self.entries = {}
+        
+        if os.path.exists(filepath):
+            try:
+                for record in load_jsonl(filepath):
+                    entry = MemoryEntry(**record)
+                    self.entries[entry.index] = entry
+            except Exception as e:
+                logger.warning(f"Could not load expert memory from {filepath}: {str(e)}")
+    
+    def get(self, index: str) -> Optional[MemoryEntry]:
+        """Get the entry stored under index, if any"""
+        return self.entries.get(index)
+    
+    def record_outcome(self, index: str, score: float):
+        """Score the pending candidate for index against the current score"""
+        entry = self.entries.get(index)
+        if entry is None or entry.candidate is None or entry.candidate_score is None:
+            return
+        
+        entry.monitoring["freq"] += 1
+        if score > entry.candidate_score:
+            entry.monitoring["pass"] += 1
+            entry.content = entry.candidate
+        else:
+            entry.monitoring["fault"] += 1
+        
+        entry.candidate = None
+        entry.candidate_score = None
+    
+    def record_candidate(self, index: str, content: str, score: float):
+        """Remember content as the pending candidate for index"""
+        entry = self.entries.setdefault(index, MemoryEntry(index=index))
+        entry.candidate = content
+        entry.candidate_score = score
+    
+    def save(self):
+        """Write all entries back to the memory file"""
+        try:
+            ensure_directory_exists(os.path.dirname(self.filepath))
+            with open(self.filepath, 'w') as f:
+                for entry in self.entries.values():
+                    f.write(json_dumps(asdict(entry), indent=False) + "\n")
+        except Exception as e:
+            logger.warning(f"Could not save expert memory to {self.filepath}: {str(e)}")
@@ -1,18 +1,70 @@
 import os
+import re
+import sys
 import json
-import pandas as pd
-import matplotlib.pyplot as plt
+import hashlib
+import bisect
+import numpy as np
 from datetime import datetime
-from tabulate import tabulate
+from collections import namedtuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Back, Style, init
 from meta_agent_system.utils.logger import get_logger
-from meta_agent_system.config.settings import RESULTS_DIR, APPLICATIONS_DIR
+from meta_agent_system.utils.helpers import load_json, json_dumps, load_application_records
+from meta_agent_system.config.settings import RESULTS_DIR, APPLICATIONS_DIR, SKIP_PLOT
 
 # Initialize colorama
 init()
 
 logger = get_logger(__name__)
 
+# Color codes used when rendering summary sections; the plain palette keeps the
+# same layout without escape codes so the report file stays readable
+CYAN, YELLOW, GREEN, WHITE, RED, BLUE, RESET = (
+    Fore.CYAN, Fore.YELLOW, Fore.GREEN, Fore.WHITE, Fore.RED, Fore.BLUE, Style.RESET_ALL
+)
+Palette = namedtuple("Palette", ["cyan", "yellow", "green", "white", "red", "blue", "reset"])
+COLOR_PALETTE = Palette(CYAN, YELLOW, GREEN, WHITE, RED, BLUE, RESET)
+PLAIN_PALETTE = Palette("", "", "", "", "", "", "")
+
+# Only emit ANSI codes to the terminal when something will actually render them
+USE_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+
+# Application rationale generation settings
+RATIONALE_BATCH_SIZE = 20
+RATIONALE_MAX_WORKERS = 4
+RATIONALE_CACHE_FILE = os.path.join(RESULTS_DIR, "rationale_cache.json")
+RATIONALE_CACHE_MAX_ENTRIES = 5000
+DEFAULT_RATIONALE = "Decision based on evaluation of application criteria."
+RATIONALE_LINE_PATTERN = re.compile(r'^[ \t]*Application[ \t]*#?(\d+):(.*)$', re.MULTILINE)
+
+# Input files, resolved once at import time
+VALIDATION_HISTORY_FILE = os.path.join(RESULTS_DIR, "validation_history.json")
+VALIDATION_RESULTS_FILE = os.path.join(RESULTS_DIR, "validation_results.json")
+
+# Application fields included in rationale prompts
+PROFILE_FIELDS = {
+    "creditHistory": ("creditTier", "creditScore", "paymentHistory"),
+    "financialInformation": ("incomeTier", "annualIncome", "debtTier", "existingDebt", "employmentStatus"),
+}
+
+# Maximum number of points annotated on the accuracy visualization
+ANNOTATION_THRESHOLD = 20
+VISUALIZATION_DPI = 90
+
+# Accuracy at or above which values are shown in yellow and green respectively
+ACCURACY_THRESHOLDS = (70, 90)
+VALIDATION_TABLE_THRESHOLDS = (80, 95)
+
+def accuracy_color(value, c, thresholds=ACCURACY_THRESHOLDS):
+    """Pick white, yellow or green for a value given the (yellow, green) lower bounds"""
+    return (c.white, c.yellow, c.green)[bisect.bisect_right(thresholds, value)]
+
+def palette(colorize=True):
+    """Return the color codes to use for a section, or empty strings for plain text"""
+    return COLOR_PALETTE if colorize else PLAIN_PALETTE
+
 def generate_summary(openai_client, best_accuracy, best_iteration, final_accuracy, iterations_completed, final_ruleset, expert_manager=None):
     """
     Generate a comprehensive summary of the credit card rule discovery process
@@ -32,117 +84,108 @@ def generate_summary(openai_client, best_accuracy, best_iteration, final_accurac
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     summary_file = os.path.join(RESULTS_DIR, f"run_summary_{timestamp}.txt")
     
-    # Create summary sections
-    stats_summary = generate_statistics_summary(best_accuracy, best_iteration, final_accuracy, iterations_completed)
-    ruleset_summary = generate_ruleset_summary(final_ruleset)
-    applications_summary = generate_applications_summary(openai_client, final_ruleset)
-    improvement_graph = generate_accuracy_visualization()
-    
-    # Add expert contributions section if available
-    experts_summary = ""
-    if expert_manager and expert_manager.dynamic_experts:
-        experts_summary = generate_experts_summary(expert_manager)
-    
-    # Combine all sections for saving to file (without colors)
-    file_summary = f"""
-{'='*80}
-                CREDIT CARD APPROVAL RULE DISCOVERY - SUMMARY REPORT
-{'='*80}
-
-{stats_summary}
-
-{ruleset_summary}
-
-{experts_summary}
-
-{applications_summary}
-
-Accuracy Improvement Visualization: {improvement_graph}
-
-{'='*80}
-                               END OF REPORT
-{'='*80}
-"""
-    
-    # Create a colorized version for terminal display
-    terminal_header = f"""
-{Fore.CYAN}{'='*80}{Style.RESET_ALL}
-{Fore.YELLOW}                CREDIT CARD APPROVAL RULE DISCOVERY - SUMMARY REPORT{Style.RESET_ALL}
-{Fore.CYAN}{'='*80}{Style.RESET_ALL}
-"""
-    
-    terminal_footer = f"""
-{Fore.CYAN}{'='*80}{Style.RESET_ALL}
-{Fore.YELLOW}                               END OF REPORT{Style.RESET_ALL}
-{Fore.CYAN}{'='*80}{Style.RESET_ALL}
-"""
-    
-    # Print colorized summary to terminal
-    print(terminal_header)
-    
-    # Print each section with colors already included
-    print(stats_summary)
-    print(ruleset_summary)
-    if experts_summary:
-        print(experts_summary)
-    print(applications_summary)
-    
-    # Print the visualization info
-    print(f"{Fore.GREEN}Accuracy Improvement Visualization:{Style.RESET_ALL} {Fore.WHITE}{improvement_graph}{Style.RESET_ALL}")
-    
-    print(terminal_footer)
-    
-    # Save the plain-text version to file
-    with open(summary_file, 'w') as f:
-        f.write(file_summary)
+    has_experts = bool(expert_manager and expert_manager.dynamic_experts)
+    
+    # Parse the validation history once; the statistics, table and chart all use it
+    validation_history = load_validation_history()
+    
+    def write_sections(outputs, colorize):
+        """Render every section once and write it to each of the given streams"""
+        def emit(text):
+            for out in outputs:
+                out.write(text)
+        
+        c = palette(colorize)
+        banner = f"{c.cyan}{'='*80}{c.reset}\n"
+        emit("\n" + banner)
+        emit(f"{c.yellow}                CREDIT CARD APPROVAL RULE DISCOVERY - SUMMARY REPORT{c.reset}\n")
+        emit(banner + "\n")
+        
+        emit(generate_statistics_summary(best_accuracy, best_iteration, final_accuracy, iterations_completed,
+                                         validation_history, colorize=colorize))
+        emit("\n\n")
+        emit(generate_ruleset_summary(final_ruleset, colorize=colorize))
+        emit("\n\n")
+        if has_experts:
+            emit(generate_experts_summary(expert_manager, colorize=colorize))
+            emit("\n\n")
+        emit(generate_applications_summary(rationales_future.result(), colorize=colorize))
+        emit("\n\n")
+        
+        emit(f"{c.green}Accuracy Improvement Visualization:{c.reset} {c.white}{graph_future.result()}{c.reset}\n\n")
+        emit(banner)
+        emit(f"{c.yellow}                               END OF REPORT{c.reset}\n")
+        emit(banner)
+    
+    # The LLM rationales and the matplotlib chart are independent and slow, so run
+    # them in the background while the other sections are rendered; both
+    # renderings share their results (the LLM is only asked once)
+    with ThreadPoolExecutor(max_workers=2) as executor, open(summary_file, 'w') as f:
+        rationales_future = executor.submit(get_applications_with_rationales, openai_client, final_ruleset)
+        graph_future = executor.submit(generate_accuracy_visualization, validation_history)
+        
+        if USE_COLOR:
+            # Print colorized summary to terminal, then the plain-text version to file
+            write_sections([sys.stdout], colorize=True)
+            write_sections([f], colorize=False)
+        else:
+            # Terminal and file get the same plain text, so render it only once
+            write_sections([sys.stdout, f], colorize=False)
     
     logger.info(f"Generated comprehensive summary: {summary_file}")
     return summary_file
 
-def generate_statistics_summary(best_accuracy, best_iteration, final_accuracy, iterations_completed):
+def load_validation_history():
+    """Load the validation history, or an empty list if it can't be read"""
+    try:
+        return load_json(VALIDATION_HISTORY_FILE)
+    except Exception as e:
+        logger.error(f"Error loading validation history: {str(e)}")
+        return []
+
+def generate_statistics_summary(best_accuracy, best_iteration, final_accuracy, iterations_completed, history, colorize=True):
     """Generate key statistics summary with ASCII chart"""
-    # Load validation history for the ASCII chart
+    c = palette(colorize)
+    
+    # Draw the ASCII chart from the validation history
     try:
-        with open(os.path.join(RESULTS_DIR, "validation_history.json"), 'r') as f:
-            history = json.load(f)
-        
         # Try the complex chart first, if it fails, fall back to the simple one
         try:
-            ascii_chart = generate_colored_ascii_chart(history)
+            ascii_chart = generate_colored_ascii_chart(history, colorize=colorize)
         except Exception as e:
             logger.warning(f"Complex ASCII chart failed: {str(e)}, falling back to simple chart")
-            ascii_chart = generate_colored_simple_ascii_chart(history)
-            
+            ascii_chart = generate_colored_simple_ascii_chart(history, colorize=colorize)
+    
     except Exception as e:
         logger.error(f"Error generating ASCII chart: {str(e)}")
-        ascii_chart = f"{Fore.RED}ASCII chart generation failed{Style.RESET_ALL}"
+        ascii_chart = f"{c.red}ASCII chart generation failed{c.reset}"
     
-    # Get the colorized validation history table
-    validation_table = get_colored_validation_history_table()
+    # Get the validation history table
+    validation_table = get_colored_validation_history_table(history, colorize=colorize)
     
     return f"""
-{Fore.GREEN}PERFORMANCE STATISTICS{Style.RESET_ALL}
-{Fore.CYAN}{'-'*21}{Style.RESET_ALL}
-{Fore.WHITE}Total Iterations: {Fore.YELLOW}{iterations_completed}{Style.RESET_ALL}
-{Fore.WHITE}Final Accuracy: {Fore.YELLOW}{final_accuracy:.2f}%{Style.RESET_ALL}
-{Fore.WHITE}Best Accuracy: {Fore.YELLOW}{best_accuracy:.2f}%{Style.RESET_ALL} (iteration {Fore.YELLOW}{best_iteration}{Style.RESET_ALL})
-{Fore.WHITE}Learning Rate: {Fore.YELLOW}{(best_accuracy / best_iteration):.2f}%{Style.RESET_ALL} per iteration
-
-{Fore.GREEN}Validation History:{Style.RESET_ALL}
+{c.green}PERFORMANCE STATISTICS{c.reset}
+{c.cyan}{'-'*21}{c.reset}
+{c.white}Total Iterations: {c.yellow}{iterations_completed}{c.reset}
+{c.white}Final Accuracy: {c.yellow}{final_accuracy:.2f}%{c.reset}
+{c.white}Best Accuracy: {c.yellow}{best_accuracy:.2f}%{c.reset} (iteration {c.yellow}{best_iteration}{c.reset})
+{c.white}Learning Rate: {c.yellow}{(best_accuracy / best_iteration):.2f}%{c.reset} per iteration
+
+{c.green}Validation History:{c.reset}
 {validation_table}
 
-{Fore.GREEN}Accuracy Improvement Chart:{Style.RESET_ALL}
+{c.green}Accuracy Improvement Chart:{c.reset}
 {ascii_chart}
 """
 
-def get_colored_validation_history_table():
-    """Get validation history as a formatted table with colors"""
+def get_colored_validation_history_table(history, colorize=True):
+    """Get validation history as a formatted table, with colors if requested"""
+    # Bind the color codes to locals once; they are used in every row below
+    c = palette(colorize)
+    cyan, yellow, green, white, red, blue, reset = c
     try:
-        with open(os.path.join(RESULTS_DIR, "validation_history.json"), 'r') as f:
-            history = json.load(f)
-            
         if not history:
-            return f"{Fore.RED}No validation history available{Style.RESET_ALL}"
+            return f"{red}No validation history available{reset}"
         
         # Create a table with iteration, accuracy, and rule count
         table_data = []
@@ -150,24 +193,29 @@ def get_colored_validation_history_table():
             iteration = entry.get("iteration", "?")
             accuracy = entry.get("accuracy", 0)
             rule_count = entry.get("rule_count", 0)
-            
+        
             # Add data without colors for tabulate to handle alignment properly
             table_data.append([iteration, f"{accuracy:.2f}%", rule_count])
         
-        # Get the table as text with proper alignment
+        # Get the table as text with proper alignment; tabulate is only needed here
+        from tabulate import tabulate
         table = tabulate(table_data, headers=["Iteration", "Accuracy", "Rule Count"], tablefmt="simple")
         
+        # Plain output needs no further processing
+        if not colorize:
+            return table
+        
         # Now colorize the output line by line
         colored_lines = []
         lines = table.split('\n')
         
         # Color the header row (first line)
         if len(lines) > 0:
-            colored_lines.append(f"{Fore.CYAN}{lines[0]}{Style.RESET_ALL}")
+            colored_lines.append(f"{cyan}{lines[0]}{reset}")
         
         # Color the separator line (second line)
         if len(lines) > 1:
-            colored_lines.append(f"{Fore.CYAN}{lines[1]}{Style.RESET_ALL}")
+            colored_lines.append(f"{cyan}{lines[1]}{reset}")
         
         # Process data rows
         for i in range(2, len(lines)):
@@ -178,225 +226,206 @@ def get_colored_validation_history_table():
             for j in range(len(header)):
                 if j > 0 and header[j-1] == ' ' and header[j] != ' ':
                     col_positions.append(j)
-            
+        
             if len(col_positions) >= 2:  # We need at least 2 column positions
                 # Split the line into columns based on positions
                 iteration_part = line[:col_positions[0]].strip()
                 accuracy_part = line[col_positions[0]:col_positions[1]].strip()
                 rule_count_part = line[col_positions[1]:].strip()
-                
+        
                 # Apply colors
-                colored_iteration = f"{Fore.YELLOW}{iteration_part}{Style.RESET_ALL}"
-                
+                colored_iteration = f"{yellow}{iteration_part}{reset}"
+        
                 # Color accuracy based on value
                 accuracy_value = float(accuracy_part.replace('%', ''))
-                if accuracy_value >= 95:
-                    colored_accuracy = f"{Fore.GREEN}{accuracy_part}{Style.RESET_ALL}"
-                elif accuracy_value >= 80:
-                    colored_accuracy = f"{Fore.YELLOW}{accuracy_part}{Style.RESET_ALL}"
-                else:
-                    colored_accuracy = f"{Fore.WHITE}{accuracy_part}{Style.RESET_ALL}"
-                
-                colored_rule_count = f"{Fore.WHITE}{rule_count_part}{Style.RESET_ALL}"
-                
+                colored_accuracy = f"{accuracy_color(accuracy_value, c, VALIDATION_TABLE_THRESHOLDS)}{accuracy_part}{reset}"
+        
+                colored_rule_count = f"{white}{rule_count_part}{reset}"
+        
                 # Rebuild the line with proper spacing and colors
                 rebuilt_line = (
-                    colored_iteration.ljust(col_positions[0]) + 
-                    colored_accuracy.ljust(col_positions[1] - col_positions[0]) + 
+                    colored_iteration.ljust(col_positions[0]) +
+                    colored_accuracy.ljust(col_positions[1] - col_positions[0]) +
                     colored_rule_count
                 )
                 colored_lines.append(rebuilt_line)
             else:
                 # Fallback if we can't determine column positions
-                colored_lines.append(f"{Fore.WHITE}{line}{Style.RESET_ALL}")
+                colored_lines.append(f"{white}{line}{reset}")
         
         return '\n'.join(colored_lines)
     
     except Exception as e:
         logger.error(f"Error generating validation history table: {str(e)}")
-        return f"{Fore.RED}Error generating validation history table: {str(e)}{Style.RESET_ALL}"
+        return f"{red}Error generating validation history table: {str(e)}{reset}"
 
-def generate_ruleset_summary(ruleset):
-    """Generate a nice display of the final ruleset with colors"""
-    rules_text = format_colored_rules_text(ruleset.get("rules", []))
+def generate_ruleset_summary(ruleset, colorize=True):
+    """Generate a nice display of the final ruleset, with colors if requested"""
+    c = palette(colorize)
+    rules_text = cached_rules_text(ruleset.get("rules", []), colorize)
     
     return f"""
-{Fore.GREEN}FINAL RULESET{Style.RESET_ALL}
-{Fore.CYAN}{'-'*12}{Style.RESET_ALL}
-{Fore.WHITE}Logic: {Fore.YELLOW}{ruleset.get('logic', 'all').upper()}{Style.RESET_ALL}
-{Fore.WHITE}Rule Count: {Fore.YELLOW}{len(ruleset.get('rules', []))}{Style.RESET_ALL}
+{c.green}FINAL RULESET{c.reset}
+{c.cyan}{'-'*12}{c.reset}
+{c.white}Logic: {c.yellow}{ruleset.get('logic', 'all').upper()}{c.reset}
+{c.white}Rule Count: {c.yellow}{len(ruleset.get('rules', []))}{c.reset}
 
 {rules_text}
 
-{Fore.GREEN}Ruleset Rationale:{Style.RESET_ALL}
-{Fore.WHITE}{ruleset.get('description', 'No description provided')}{Style.RESET_ALL}
+{c.green}Ruleset Rationale:{c.reset}
+{c.white}{ruleset.get('description', 'No description provided')}{c.reset}
 """
 
-def format_colored_rules_text(rules, indent=0):
-    """Format rules as readable text with indentation and colors"""
-    result = []
+def cached_rules_text(rules, colorize=True):
+    """Format a rules list, reusing earlier results for rules with the same content"""
+    # Keyed on canonical JSON rather than the list object, so rules changed in place are reformatted
+    return "\n".join(format_rule_group(json.dumps(rules, sort_keys=True), 0, colorize))
+
+def format_colored_rules_text(rules, indent=0, colorize=True):
+    """Format rules as readable text with indentation and, optionally, colors"""
+    lines = []
+    append_rules_lines(rules, indent, colorize, lines)
+    return "\n".join(lines)
+
+@lru_cache(maxsize=1024)
+def format_rule_group(rules_json, indent, colorize):
+    """Format the rules of a nested group, given as canonical JSON, into a tuple of lines"""
+    lines = []
+    append_rules_lines(json.loads(rules_json), indent, colorize, lines)
+    return tuple(lines)
+
+def append_rules_lines(rules, indent, colorize, lines):
+    """Append one formatted line per rule to lines, recursing into rule groups"""
+    cyan, yellow, green, white, red, blue, reset = palette(colorize)
+    prefix = "  " * indent
     
     for rule in rules:
-        prefix = "  " * indent
-        
         if "rules" in rule:
-            # Nested rule group
-            result.append(f"{Fore.YELLOW}{prefix}Rule Group ({rule.get('logic', 'all').upper()}):{Style.RESET_ALL}")
-            # Get nested rules text and add each line with proper indentation
-            nested_rules = format_colored_rules_text(rule.get("rules", []), indent + 1)
-            for line in nested_rules.split('\n'):
-                if line.strip():  # Only add non-empty lines
-                    result.append(line)
+            # Nested rule group, one level deeper. Groups are formatted through a cache keyed
+            # on their canonical JSON, so a group repeated in the ruleset is formatted once
+            lines.append(f"{yellow}{prefix}Rule Group ({rule.get('logic', 'all').upper()}):{reset}")
+            lines.extend(format_rule_group(json.dumps(rule["rules"], sort_keys=True), indent + 1, colorize))
         elif "field" in rule:
             # Standard rule
-            field = rule.get("field", "").split(".")[-1]  # Just the field name
+            field = rule["field"].split(".")[-1]  # Just the field name
             condition = rule.get("condition", "")
-            
+        
             if "threshold" in rule:
-                value = rule.get("threshold")
-                result.append(f"{Fore.CYAN}{prefix}• {field}{Style.RESET_ALL} {Fore.WHITE}{condition}{Style.RESET_ALL} {Fore.GREEN}{value}{Style.RESET_ALL}")
+                lines.append(f"{cyan}{prefix}• {field}{reset} {white}{condition}{reset} {green}{rule['threshold']}{reset}")
             elif "values" in rule:
-                values = rule.get("values", [])
-                result.append(f"{Fore.CYAN}{prefix}• {field}{Style.RESET_ALL} {Fore.WHITE}{condition}{Style.RESET_ALL} {Fore.GREEN}{values}{Style.RESET_ALL}")
-    
-    return "\n".join(result)
+                lines.append(f"{cyan}{prefix}• {field}{reset} {white}{condition}{reset} {green}{rule['values']}{reset}")
 
-def generate_applications_summary(openai_client, final_ruleset):
-    """Generate a summary of applications with approval rationales using LLM"""
+def get_applications_with_rationales(openai_client, final_ruleset):
+    """Load applications with their results and LLM-generated rationales"""
     # Load applications and results
     apps_with_results = load_applications_with_results()
     
     if not apps_with_results:
-        return f"{Fore.RED}No application data available for summary{Style.RESET_ALL}"
+        return []
     
     # Get LLM-generated rationales for each application
-    apps_with_rationales = generate_application_rationales(openai_client, apps_with_results, final_ruleset)
+    return generate_application_rationales(openai_client, apps_with_results, final_ruleset)
+
+def generate_applications_summary(apps_with_rationales, colorize=True):
+    """Generate a summary table of applications with their approval rationales"""
+    c = palette(colorize)
+    
+    if not apps_with_rationales:
+        return f"{c.red}No application data available for summary{c.reset}"
     
-    # Create a neat table with colors
+    # Each cell is its text plus the color to wrap it in; widths come from the text alone
+    approved_cell = ("APPROVED", c.green)
+    declined_cell = ("DECLINED", c.red)
+    correct_cell = ("Correct", c.green)
+    incorrect_cell = ("Incorrect", c.red)
+    
+    # Create a neat table
     table_data = []
     for app in apps_with_rationales:
         table_data.append([
-            app["id"],
-            app["name"],
-            "APPROVED" if app["approved"] else "DECLINED",
-            "Correct" if app["correct"] else "Incorrect",
-            app["rationale"]
+            (str(app["id"]), ""),
+            (app["name"].strip(), c.white),
+            approved_cell if app["approved"] else declined_cell,
+            correct_cell if app["correct"] else incorrect_cell,
+            (app["rationale"].strip(), c.white)
         ])
     
-    # Get basic table as text
-    table = tabulate(
-        table_data, 
-        headers=["App ID", "Applicant", "Decision", "Classification", "Rationale"],
-        tablefmt="grid"
-    )
-    
-    # Colorize the table
-    lines = table.split('\n')
-    colored_lines = []
-    
-    header_processed = False
-    
-    for line in lines:
-        if '|' not in line:
-            # Grid lines without data, keep as is with cyan color
-            colored_lines.append(f"{Fore.CYAN}{line}{Style.RESET_ALL}")
-        elif not header_processed:
-            # This is the header line, color it differently
-            parts = line.split('|')
-            colored_parts = [Fore.CYAN + parts[0]]
-            
-            for part in parts[1:-1]:  # Skip first and last (they're grid edges)
-                if part.strip():
-                    colored_parts.append(f"{Fore.YELLOW}{part}{Style.RESET_ALL}")
-                else:
-                    colored_parts.append(part)
-            
-            colored_parts.append(Fore.CYAN + parts[-1] + Style.RESET_ALL)
-            colored_lines.append('|'.join(colored_parts))
-            header_processed = True
-        else:
-            # Data lines, color based on content
-            if "APPROVED" in line:
-                # Color approved rows
-                parts = line.split('|')
-                colored_parts = [Fore.CYAN + parts[0]]
-                
-                for i, part in enumerate(parts[1:-1]):
-                    if i == 2:  # Decision column
-                        colored_parts.append(f"{Fore.GREEN}{part}{Style.RESET_ALL}")
-                    elif i == 3:  # Classification column
-                        if "Correct" in part:
-                            colored_parts.append(f"{Fore.GREEN}{part}{Style.RESET_ALL}")
-                        else:
-                            colored_parts.append(f"{Fore.RED}{part}{Style.RESET_ALL}")
-                    else:
-                        colored_parts.append(f"{Fore.WHITE}{part}{Style.RESET_ALL}")
-                
-                colored_parts.append(Fore.CYAN + parts[-1] + Style.RESET_ALL)
-                colored_lines.append('|'.join(colored_parts))
-            elif "DECLINED" in line:
-                # Color declined rows
-                parts = line.split('|')
-                colored_parts = [Fore.CYAN + parts[0]]
-                
-                for i, part in enumerate(parts[1:-1]):
-                    if i == 2:  # Decision column
-                        colored_parts.append(f"{Fore.RED}{part}{Style.RESET_ALL}")
-                    elif i == 3:  # Classification column
-                        if "Correct" in part:
-                            colored_parts.append(f"{Fore.GREEN}{part}{Style.RESET_ALL}")
-                        else:
-                            colored_parts.append(f"{Fore.RED}{part}{Style.RESET_ALL}")
-                    else:
-                        colored_parts.append(f"{Fore.WHITE}{part}{Style.RESET_ALL}")
-                
-                colored_parts.append(Fore.CYAN + parts[-1] + Style.RESET_ALL)
-                colored_lines.append('|'.join(colored_parts))
-            else:
-                # Other lines (separators)
-                colored_lines.append(f"{Fore.CYAN}{line}{Style.RESET_ALL}")
-    
-    colored_table = '\n'.join(colored_lines)
+    headers = ["App ID", "Applicant", "Decision", "Classification", "Rationale"]
+    table = format_grid_table(headers, table_data, c.yellow, c.reset, right_aligned=(0,))
     
     return f"""
-{Fore.GREEN}APPLICATION DECISIONS WITH RATIONALES{Style.RESET_ALL}
-{Fore.CYAN}{'-'*35}{Style.RESET_ALL}
-{colored_table}
+{c.green}APPLICATION DECISIONS WITH RATIONALES{c.reset}
+{c.cyan}{'-'*35}{c.reset}
+{table}
 """
 
+def format_grid_table(headers, rows, header_color, reset, right_aligned=()):
+    """
+    Render rows of (text, color) cells in the borders and padding of tabulate's "grid" format.
+    
+    Alignment differs on purpose: tabulate right-aligns cells that look like numbers,
+    while here only the columns listed in right_aligned are, so a text column such as
+    the rationales stays left-aligned whatever its cells contain.
+    
+    Column widths are measured once on the plain text, so colors never need to be
+    stripped back out, and every row is padded in a single pass.
+    """
+    widths = [len(header) + 2 for header in headers]
+    for row in rows:
+        for i, (text, _) in enumerate(row):
+            if len(text) > widths[i]:
+                widths[i] = len(text)
+    
+    def format_row(cells):
+        parts = []
+        for i, (text, color) in enumerate(cells):
+            padding = " " * (widths[i] - len(text))
+            if color:
+                text = f"{color}{text}{reset}"
+            parts.append(padding + text if i in right_aligned else text + padding)
+        return "| " + " | ".join(parts) + " |"
+    
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    lines = [border, format_row([(header, header_color) for header in headers]), border.replace("-", "=")]
+    for row in rows:
+        lines.append(format_row(row))
+        lines.append(border)
+    return "\n".join(lines)
+
+def extract_application_profile(app_data):
+    """Keep only the application fields the summary uses, dropping the rest of the record"""
+    return {
+        section: {field: app_data.get(section, {}).get(field) for field in fields}
+        for section, fields in PROFILE_FIELDS.items()
+    }
+
 def load_applications_with_results():
     """Load applications with validation results"""
     try:
         # Load applications
         applications = []
-        app_files = [f for f in os.listdir(APPLICATIONS_DIR) 
-                    if f.startswith("application_") and f.endswith(".json")]
-        
-        app_files.sort(key=lambda f: int(f.replace("application_", "").replace(".json", "")))
-        
-        for f in app_files:
-            app_id = int(f.replace("application_", "").replace(".json", ""))
-            file_path = os.path.join(APPLICATIONS_DIR, f)
-            
-            with open(file_path, 'r') as file:
-                app_data = json.load(file)
-                applications.append({
-                    "id": app_id,
-                    "name": app_data.get("personalDetails", {}).get("name", f"Applicant {app_id}"),
-                    "data": app_data
-                })
+        for app_id, app_data in load_application_records(APPLICATIONS_DIR):
+            applications.append({
+                "id": app_id,
+                "name": app_data.get("personalDetails", {}).get("name", f"Applicant {app_id}"),
+                "data": extract_application_profile(app_data)
+            })
         
         # Load validation results
-        with open(os.path.join(RESULTS_DIR, "validation_results.json"), 'r') as f:
-            validation_results = json.load(f)
+        validation_results = load_json(VALIDATION_RESULTS_FILE)
+        
+        # Index results by application ID so each application is matched in one lookup;
+        # the first result for an ID wins, as with the previous linear scan
+        results_by_id = {}
+        for result in validation_results.get("results", []):
+            results_by_id.setdefault(result.get("application_id"), result)
         
         # Combine applications with results
         for app in applications:
-            for result in validation_results.get("results", []):
-                if result.get("application_id") == app["id"]:
-                    app["approved"] = result.get("decision") == "approved"
-                    app["correct"] = result.get("correct", False)
-                    break
+            result = results_by_id.get(app["id"])
+            if result is not None:
+                app["approved"] = result.get("decision") == "approved"
+                app["correct"] = result.get("correct", False)
         
         return applications
     
@@ -404,26 +433,53 @@ def load_applications_with_results():
         logger.error(f"Error loading applications with results: {str(e)}")
         return []
 
-def generate_application_rationales(openai_client, applications, ruleset):
-    """Use LLM to generate approval/decline rationales for applications"""
-    
-    # Create a batch of applications to analyze (limit to 10 for efficiency)
-    batch = applications[:10] if len(applications) > 10 else applications
+def load_rationale_cache():
+    """Load previously generated rationales keyed by ruleset/application hash"""
+    try:
+        return load_json(RATIONALE_CACHE_FILE)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return {}
+
+def save_rationale_cache(cache):
+    """Persist generated rationales so later runs can reuse them"""
+    # Drop the least recently used entries once the cache outgrows its limit
+    if len(cache) > RATIONALE_CACHE_MAX_ENTRIES:
+        cache = dict(list(cache.items())[-RATIONALE_CACHE_MAX_ENTRIES:])
     
+    try:
+        with open(RATIONALE_CACHE_FILE, 'w') as f:
+            f.write(json_dumps(cache, indent=False))
+    except Exception as e:
+        logger.warning(f"Could not save rationale cache: {str(e)}")
+
+def serialize_ruleset(ruleset):
+    """Serialize a ruleset compactly for prompts"""
+    return json_dumps(ruleset, indent=False)
+
+def rationale_cache_key(ruleset_hash, app):
+    """Build a cache key from the ruleset hash and the application's profile"""
+    # Use the standard library here so keys stay stable whether or not orjson is installed
+    profile = json.dumps({"data": app["data"], "approved": app["approved"]}, sort_keys=True)
+    app_hash = ruleset_hash.copy()
+    app_hash.update(profile.encode("utf-8"))
+    return app_hash.hexdigest()
+
+def request_rationales(openai_client, batch, ruleset_json):
+    """Ask the LLM for rationales for a single batch of applications"""
     # Create a prompt explaining the ruleset and applications
-    prompt = f"""
+    parts = [f"""
 I need explanations for why these credit card applications were approved or declined.
 
 The approval rules are:
 ```json
-{json.dumps(ruleset, indent=2)}
+{ruleset_json}
 ```
 
 Please explain in a short, clear sentence why each application was approved or declined 
 based on these rules. Focus on the specific rule or criteria that determined the decision.
 
 Here are the applications:
-"""
+"""]
 
     # Add application details to the prompt
     for app in batch:
@@ -431,7 +487,7 @@ Here are the applications:
         credit_info = data.get("creditHistory", {})
         financial_info = data.get("financialInformation", {})
         
-        prompt += f"""
+        parts.append(f"""
 Application #{app['id']} ({app['name']}): {'APPROVED' if app['approved'] else 'DECLINED'}
 - Credit Tier: {credit_info.get('creditTier')}
 - Credit Score: {credit_info.get('creditScore')}
@@ -441,32 +497,94 @@ Application #{app['id']} ({app['name']}): {'APPROVED' if app['approved'] else 'D
 - Debt Tier: {financial_info.get('debtTier')}
 - Existing Debt: ${financial_info.get('existingDebt')}
 - Employment Status: {financial_info.get('employmentStatus')}
-"""
+""")
 
-    prompt += """
+    parts.append("""
 For each application, provide a rationale like:
 Application #X: [Decision rationale in one clear sentence]
-"""
+""")
+    prompt = "".join(parts)
 
-    # Get LLM response
+    response = openai_client.generate(
+        prompt=prompt,
+        system_message="You are a Credit Card Analyst who explains application decisions clearly and concisely.",
+        temperature=0.3,
+        expert_name="Summary Generator"
+    )
+    
+    # Parse LLM response to extract rationales
+    return parse_rationales(response, batch)
+
+def generate_application_rationales(openai_client, applications, ruleset):
+    """Use LLM to generate approval/decline rationales for applications"""
     try:
-        response = openai_client.generate(
-            prompt=prompt,
-            system_message="You are a Credit Card Analyst who explains application decisions clearly and concisely.",
-            temperature=0.3,
-            expert_name="Summary Generator"
-        )
-        
-        # Parse LLM response to extract rationales
-        rationales = parse_rationales(response, batch)
+        # Serialize and hash the ruleset once; every batch prompt and cache key reuses it
+        ruleset_json = serialize_ruleset(ruleset)
+        ruleset_hash = hashlib.sha256(ruleset_json.encode("utf-8"))
+        
+        # Reuse rationales from earlier runs for unchanged (ruleset, application) pairs
+        cache = load_rationale_cache()
+        cache_keys = {app["id"]: rationale_cache_key(ruleset_hash, app) for app in applications}
+        pending = []
+        cache_reordered = False
+        for app in applications:
+            cache_key = cache_keys[app["id"]]
+            if cache_key in cache:
+                # Move hits to the end so they are the last to be evicted
+                if next(reversed(cache)) != cache_key:
+                    cache[cache_key] = cache.pop(cache_key)
+                    cache_reordered = True
+            else:
+                pending.append(app)
+        
+        # Split the remaining applications into batches and request them concurrently
+        batches = [pending[i:i + RATIONALE_BATCH_SIZE] for i in range(0, len(pending), RATIONALE_BATCH_SIZE)]
+        if batches:
+            logger.info(f"Requesting rationales for {len(pending)} applications in {len(batches)} batches "
+                        f"({len(applications) - len(pending)} cached)")
+            def collect_rationales(futures):
+                """Cache the rationales each request returned and list the applications left without one"""
+                missing = []
+                for future, batch in futures.items():
+                    try:
+                        rationales = future.result()
+                    except Exception as e:
+                        logger.error(f"Error generating application rationales for batch: {str(e)}")
+                        rationales = {}
+                    
+                    for app in batch:
+                        rationale = rationales.get(app["id"])
+                        # Only keep rationales the LLM actually provided
+                        if rationale and rationale != DEFAULT_RATIONALE:
+                            cache[cache_keys[app["id"]]] = rationale
+                        elif len(batch) > 1:
+                            missing.append(app)
+                return missing
+            
+            with ThreadPoolExecutor(max_workers=RATIONALE_MAX_WORKERS) as executor:
+                futures = {executor.submit(request_rationales, openai_client, batch, ruleset_json): batch
+                           for batch in batches}
+                missing = collect_rationales(futures)
+                
+                # A failed or truncated batch response shouldn't cost every application in it,
+                # so ask again for the ones it left out, one application per request
+                if missing:
+                    logger.info(f"Retrying rationales for {len(missing)} applications individually")
+                    retries = {executor.submit(request_rationales, openai_client, [app], ruleset_json): [app]
+                               for app in missing}
+                    collect_rationales(retries)
+        
+        # Save new rationales, and the recency order even when every application was a hit
+        if batches or cache_reordered:
+            save_rationale_cache(cache)
         
         # Add rationales to applications
         for app in applications:
-            app_id = app["id"]
-            if app_id in rationales:
-                app["rationale"] = rationales[app_id]
+            cache_key = cache_keys[app["id"]]
+            if cache_key in cache:
+                app["rationale"] = cache[cache_key]
             else:
-                # For applications beyond the batch size, provide a default rationale
+                # For applications without an LLM rationale, provide a default rationale
                 logic = ruleset.get("logic", "all")
                 tier_text = ""
                 
@@ -499,54 +617,61 @@ def parse_rationales(llm_response, applications):
     rationales = {}
     
     # Extract application IDs
-    app_ids = [app["id"] for app in applications]
-    
-    # Simple parsing logic - look for lines starting with "Application #"
-    lines = llm_response.split("\n")
-    for line in lines:
-        line = line.strip()
-        
-        # Check for application reference
-        for app_id in app_ids:
-            if line.startswith(f"Application #{app_id}:") or line.startswith(f"Application {app_id}:"):
-                # Extract the rationale part after the colon
-                parts = line.split(":", 1)
-                if len(parts) > 1:
-                    rationales[app_id] = parts[1].strip()
-                break
+    app_ids = {app["id"] for app in applications}
+    
+    # Match every "Application #X: ..." line in a single pass
+    for match in RATIONALE_LINE_PATTERN.finditer(llm_response):
+        app_id = int(match.group(1))
+        if app_id in app_ids:
+            rationales[app_id] = match.group(2).strip()
     
     # Ensure we have a rationale for each application
     for app in applications:
         if app["id"] not in rationales:
-            rationales[app["id"]] = "Decision based on evaluation of application criteria."
+            rationales[app["id"]] = DEFAULT_RATIONALE
     
     return rationales
 
-def generate_accuracy_visualization():
+def generate_accuracy_visualization(validation_history):
     """Generate visualization of accuracy improvements over iterations"""
-    # Load validation history
+    if SKIP_PLOT:
+        logger.info("Skipping accuracy visualization (META_AGENT_SKIP_PLOT is set)")
+        return "Visualization skipped"
+    
     try:
-        with open(os.path.join(RESULTS_DIR, "validation_history.json"), 'r') as f:
-            validation_history = json.load(f)
-        
         if not validation_history:
             logger.warning("No validation history available for visualization")
             return "No visualization available (empty validation history)"
         
-        # Extract data
-        iterations = [entry.get("iteration", i) for i, entry in enumerate(validation_history)]
-        accuracies = [entry.get("accuracy", 0) for entry in validation_history]
-        rule_counts = [entry.get("rule_count", 0) for entry in validation_history]
+        # Extract data in a single pass into preallocated arrays
+        n = len(validation_history)
+        iterations = np.empty(n, dtype=np.int32)
+        accuracies = np.empty(n, dtype=np.float64)
+        rule_counts = np.empty(n, dtype=np.int32)
+        for i, entry in enumerate(validation_history):
+            iterations[i] = entry.get("iteration", i)
+            accuracies[i] = entry.get("accuracy", 0)
+            rule_counts[i] = entry.get("rule_count", 0)
+        
+        # Annotate every point for short histories, every Kth point for long ones
+        stride = (n + ANNOTATION_THRESHOLD - 1) // ANNOTATION_THRESHOLD
+        
+        # Import matplotlib only when a chart is actually drawn. A bare Figure
+        # renders straight to PNG through Agg without pyplot's global figure
+        # state, which also keeps this safe to run on a background thread
+        from matplotlib.figure import Figure
         
         # Create figure with two subplots
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10), gridspec_kw={'height_ratios': [3, 1]})
+        fig = Figure(figsize=(12, 10))
+        ax1, ax2 = fig.subplots(2, 1, gridspec_kw={'height_ratios': [3, 1]})
         
         # Plot accuracy on top subplot
-        ax1.plot(iterations, accuracies, marker='o', linestyle='-', color='blue', linewidth=2, markersize=8)
+        ax1.plot(iterations, accuracies, marker='o', linestyle='-', color='blue', linewidth=2, markersize=8, rasterized=True)
         ax1.axhline(y=100, color='green', linestyle='--', alpha=0.7, label='Target Accuracy')
         
         # Add annotations for accuracy values
-        for i, accuracy in enumerate(accuracies):
+        for i in range(0, n, stride):
+            accuracy = accuracies[i]
             ax1.annotate(f"{accuracy:.1f}%", 
                        (iterations[i], accuracy),
                        textcoords="offset points", 
@@ -560,26 +685,26 @@ def generate_accuracy_visualization():
         ax1.legend()
         
         # Plot rule count on bottom subplot
-        ax2.bar(iterations, rule_counts, color='orange', alpha=0.7)
+        ax2.bar(iterations, rule_counts, color='orange', alpha=0.7, rasterized=True)
         ax2.set_xlabel('Iteration', fontsize=12)
         ax2.set_ylabel('Rule Count', fontsize=12)
         ax2.grid(True, axis='y', alpha=0.3)
         
         # Add annotations for rule counts
-        for i, count in enumerate(rule_counts):
+        for i in range(0, n, stride):
+            count = rule_counts[i]
             ax2.annotate(f"{count}", 
                        (iterations[i], count),
                        textcoords="offset points", 
                        xytext=(0,5), 
                        ha='center')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save visualization
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         viz_file = os.path.join(RESULTS_DIR, f"accuracy_improvement_{timestamp}.png")
-        plt.savefig(viz_file)
-        plt.close()
+        fig.savefig(viz_file, dpi=VISUALIZATION_DPI)
         
         logger.info(f"Generated accuracy visualization: {viz_file}")
         return viz_file
@@ -588,10 +713,12 @@ def generate_accuracy_visualization():
         logger.error(f"Error generating accuracy visualization: {str(e)}")
         return "Error generating visualization"
 
-def generate_colored_ascii_chart(history_data):
-    """Generate a colored ASCII chart of accuracy over iterations"""
+def generate_colored_ascii_chart(history_data, colorize=True):
+    """Generate an ASCII chart of accuracy over iterations, colored if requested"""
+    c = palette(colorize)
+    cyan, yellow, green, white, red, blue, reset = c
     if not history_data:
-        return f"{Fore.RED}No data available for chart{Style.RESET_ALL}"
+        return f"{red}No data available for chart{reset}"
     
     # Extract data
     iterations = [entry.get("iteration", i+1) for i, entry in enumerate(history_data)]
@@ -605,75 +732,56 @@ def generate_colored_ascii_chart(history_data):
     result = []
     
     # Add title
-    result.append(f"{Fore.YELLOW}Accuracy Over Iterations{Style.RESET_ALL}")
-    result.append(f"{Fore.CYAN}{'-' * 25}{Style.RESET_ALL}")
+    result.append(f"{yellow}Accuracy Over Iterations{reset}")
+    result.append(f"{cyan}{'-' * 25}{reset}")
+    
+    # Precompute each point's row and its rendered cell once, instead of per row
+    acc_heights = np.trunc((100 - np.asarray(accuracies, dtype=np.float64)) * height / 100).astype(np.int64)
+    point_cells = np.array([f"{accuracy_color(acc, c)}o{reset}  " for acc in accuracies], dtype=object)
+    line_cell = f"{blue}|{reset}  "
+    
+    # Fill the grid with masks instead of per-cell branches. A column gets a
+    # connecting line on the rows strictly between the previous, higher point
+    # and its own point; the first column has no previous point
+    row_index = np.arange(height + 1)[:, None]
+    line_start = np.concatenate(([height + 1], acc_heights[:-1] + 1))
+    grid = np.full((height + 1, len(accuracies)), "   ", dtype=object)
+    grid[(row_index >= line_start) & (row_index < acc_heights)] = line_cell
+    
+    # Data points, skipping any that fall outside the 0-100% range
+    on_chart = (acc_heights >= 0) & (acc_heights <= height)
+    grid[acc_heights[on_chart], np.flatnonzero(on_chart)] = point_cells[on_chart]
     
     # Create rows from top (100%) to bottom (0%)
-    for h in range(height + 1):
-        row = []
+    for h, row in enumerate(grid):
         # Y-axis labels
         y_value = 100 - (h * 100 // height)
         
         # Color the y-axis labels based on value
-        if y_value >= 90:
-            y_color = Fore.GREEN
-        elif y_value >= 70:
-            y_color = Fore.YELLOW
-        else:
-            y_color = Fore.WHITE
-            
-        row.append(f"{y_color}{y_value:3d}%{Style.RESET_ALL} {Fore.CYAN}|{Style.RESET_ALL}")
-        
-        # Plot points and lines
-        for i, acc in enumerate(accuracies):
-            x_pos = i * 3 + 5
-            # Determine if this accuracy level should be marked at this height
-            acc_height = int((100 - acc) * height / 100)
-            
-            if h == acc_height:
-                # Choose color based on accuracy
-                if acc >= 90:
-                    point_color = Fore.GREEN
-                elif acc >= 70:
-                    point_color = Fore.YELLOW
-                else:
-                    point_color = Fore.WHITE
-                    
-                row.append(f"{point_color}o{Style.RESET_ALL}  ")  # Data point
-            elif h < acc_height:
-                # Check if there should be a connecting line
-                if i > 0:
-                    prev_acc = accuracies[i-1]
-                    prev_height = int((100 - prev_acc) * height / 100)
-                    if prev_height < h < acc_height or acc_height < h < prev_height:
-                        row.append(f"{Fore.BLUE}|{Style.RESET_ALL}  ")
-                    else:
-                        row.append("   ")
-                else:
-                    row.append("   ")
-            else:
-                row.append("   ")
+        y_color = accuracy_color(y_value, c)
         
-        result.append("".join(row))
+        result.append(f"{y_color}{y_value:3d}%{reset} {cyan}|{reset}" + "".join(row))
     
     # Add x-axis
-    x_axis = f"     {Fore.CYAN}" + "".join(f"{it:3d}" for it in iterations) + f"{Style.RESET_ALL}"
-    result.append(f"     {Fore.CYAN}" + "-" * (len(iterations) * 3) + f"{Style.RESET_ALL}")
+    x_axis = f"     {cyan}" + "".join(f"{it:3d}" for it in iterations) + f"{reset}"
+    result.append(f"     {cyan}" + "-" * (len(iterations) * 3) + f"{reset}")
     result.append(x_axis)
-    result.append(f"     {Fore.YELLOW}Iteration{Style.RESET_ALL}")
+    result.append(f"     {yellow}Iteration{reset}")
     
     return "\n".join(result)
 
-def generate_colored_simple_ascii_chart(history_data):
-    """Generate a very simple colored ASCII bar chart showing accuracy progress"""
+def generate_colored_simple_ascii_chart(history_data, colorize=True):
+    """Generate a very simple ASCII bar chart showing accuracy progress, colored if requested"""
+    c = palette(colorize)
+    cyan, yellow, green, white, red, blue, reset = c
     if not history_data:
-        return f"{Fore.RED}No data available for chart{Style.RESET_ALL}"
+        return f"{red}No data available for chart{reset}"
     
     # Extract data
     iterations = [entry.get("iteration", i+1) for i, entry in enumerate(history_data)]
     accuracies = [entry.get("accuracy", 0) for entry in history_data]
     
-    result = [f"{Fore.YELLOW}Accuracy Over Iterations:{Style.RESET_ALL}", f"{Fore.CYAN}{'-' * 25}{Style.RESET_ALL}"]
+    result = [f"{yellow}Accuracy Over Iterations:{reset}", f"{cyan}{'-' * 25}{reset}"]
     
     # Generate a simple bar chart
     for i, acc in enumerate(accuracies):
@@ -682,21 +790,15 @@ def generate_colored_simple_ascii_chart(history_data):
         bar_width = int(acc / 5)  # 100% = 20 characters
         
         # Choose color based on accuracy
-        if acc >= 90:
-            bar_color = Fore.GREEN
-        elif acc >= 70:
-            bar_color = Fore.YELLOW
-        else:
-            bar_color = Fore.WHITE
-            
-        bar = bar_color + "█" * bar_width + Style.RESET_ALL
+        bar = accuracy_color(acc, c) + "█" * bar_width + reset
         
-        result.append(f"{Fore.CYAN}Iter {iter_num:2d} |{Style.RESET_ALL} {bar} {Fore.WHITE}{acc:.1f}%{Style.RESET_ALL}")
+        result.append(f"{cyan}Iter {iter_num:2d} |{reset} {bar} {white}{acc:.1f}%{reset}")
     
     return "\n".join(result)
 
-def generate_experts_summary(expert_manager):
+def generate_experts_summary(expert_manager, colorize=True):
     """Generate a summary of dynamic experts contributions"""
+    c = palette(colorize)
     if not expert_manager or not expert_manager.dynamic_experts:
         return ""
     
@@ -704,19 +806,19 @@ def generate_experts_summary(expert_manager):
     contributions = expert_manager.expert_contributions
     
     result = f"""
-{Fore.GREEN}DYNAMIC EXPERTS CONTRIBUTIONS{Style.RESET_ALL}
-{Fore.CYAN}{'-'*30}{Style.RESET_ALL}
-{Fore.WHITE}Number of Dynamic Experts: {Fore.YELLOW}{len(experts)}{Style.RESET_ALL}
+{c.green}DYNAMIC EXPERTS CONTRIBUTIONS{c.reset}
+{c.cyan}{'-'*30}{c.reset}
+{c.white}Number of Dynamic Experts: {c.yellow}{len(experts)}{c.reset}
 """
     
     # List experts by name
-    result += f"\n{Fore.WHITE}Specialized Expertise Areas:{Style.RESET_ALL}\n"
+    result += f"\n{c.white}Specialized Expertise Areas:{c.reset}\n"
     for expert in experts:
-        result += f"{Fore.CYAN}• {expert.name}{Style.RESET_ALL}\n"
+        result += f"{c.cyan}• {expert.name}{c.reset}\n"
     
     # Summarize contributions
     if contributions:
-        result += f"\n{Fore.WHITE}Key Contributions:{Style.RESET_ALL}\n"
+        result += f"\n{c.white}Key Contributions:{c.reset}\n"
         
         # Sort by improvement amount
         sorted_contribs = sorted(
@@ -730,8 +832,8 @@ def generate_experts_summary(expert_manager):
             improvement = contrib.get("improvement", 0)
             experts = contrib.get("contributing_experts", [])
             
-            result += f"{Fore.YELLOW}Iteration {iter_num}:{Style.RESET_ALL} "
-            result += f"{Fore.GREEN}+{improvement:.2f}%{Style.RESET_ALL} "
-            result += f"{Fore.WHITE}improvement with insights from {Fore.CYAN}{', '.join(experts)}{Style.RESET_ALL}\n"
+            result += f"{c.yellow}Iteration {iter_num}:{c.reset} "
+            result += f"{c.green}+{improvement:.2f}%{c.reset} "
+            result += f"{c.white}improvement with insights from {c.cyan}{', '.join(experts)}{c.reset}\n"
     
     return result
@@ -1,9 +1,10 @@
 import uuid
 import time
+from dataclasses import dataclass, field, asdict
 from typing import Dict, Any, Optional, List
-from pydantic import BaseModel, Field
 
-class Task(BaseModel):
+@dataclass
+class Task:
     """
     Represents a task to be executed by an expert agent.
     
@@ -22,25 +23,22 @@ class Task(BaseModel):
         dependencies: List of task IDs this task depends on
         spawn_tasks: List of task IDs spawned by this task
     """
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     description: str
     task_type: str
-    data: Dict[str, Any] = Field(default_factory=dict)
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    data: Dict[str, Any] = field(default_factory=dict)
     priority: int = 5
     parent_id: Optional[str] = None
     status: str = "pending"
     result: Optional[Dict[str, Any]] = None
     agent_assigned: Optional[str] = None
-    created_at: Optional[float] = None
+    created_at: Optional[float] = field(default_factory=time.time)
     completed_at: Optional[float] = None
-    dependencies: List[str] = Field(default_factory=list)
-    spawn_tasks: List[str] = Field(default_factory=list)
+    dependencies: List[str] = field(default_factory=list)
+    spawn_tasks: List[str] = field(default_factory=list)
     
-    class Config:
-        arbitrary_types_allowed = True
-    
-    def __init__(self, **data):
-        super().__init__(**data)
+    def __post_init__(self):
+        # Passing created_at=None means "now", as it did before
         if self.created_at is None:
             self.created_at = time.time()
     
@@ -83,7 +81,6 @@ class Task(BaseModel):
             return NotImplemented
         return self.priority < other.priority
 
-    def dict(self):
-        if hasattr(self, 'model_dump'):
-            return self.model_dump()
-        # Fall back to original implementation
+    def dict(self) -> Dict[str, Any]:
+        """Get the task as a plain dictionary"""
+        return asdict(self)
@@ -3,14 +3,60 @@ import json
 from meta_agent_system.core.expert_agent import ExpertAgent
 from meta_agent_system.llm.openai_client import OpenAIClient
 from meta_agent_system.utils.logger import get_logger
+from meta_agent_system.utils.helpers import load_json, save_json, json_dumps, json_loads, find_json_object
 import os
-from meta_agent_system.config.settings import RESULTS_DIR
+from meta_agent_system.config.settings import RESULTS_DIR, RECOMMENDER_MODEL
 import time
 import re
-from datetime import datetime
 
 logger = get_logger(__name__)
 
+# Patterns for repairing JSON in LLM responses, compiled once
+COMMENT_PATTERN = re.compile(r'//.*')
+TRAILING_COMMA_OBJECT_PATTERN = re.compile(r',\s*}')
+TRAILING_COMMA_ARRAY_PATTERN = re.compile(r',\s*]')
+UNQUOTED_KEY_PATTERN = re.compile(r'(\s*)(\w+)(\s*):([^"])')
+SINGLE_QUOTED_PATTERN = re.compile(r"'([^']*)'")
+
+# Token budgets for the recommendations: 3-4 experts at roughly 300 tokens each, and
+# a larger budget for a second attempt if the first was cut off before its JSON closed
+RECOMMENDATION_MAX_TOKENS = (1200, 2000)
+
+# Ruleset maintained by the rule refiner
+RULESET_FILE = os.path.join(RESULTS_DIR, "credit_card_approval_rules.json")
+
+# Recommendation records are saved as f"{RECOMMENDATIONS_FILE_PREFIX}{timestamp}.json"
+RECOMMENDATIONS_FILE_PREFIX = os.path.join(RESULTS_DIR, "expertise_recommendations_")
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+def save_record(data, filepath):
+    """Save a JSON record (or raw text), logging instead of raising on failure"""
+    try:
+        if isinstance(data, str):
+            with open(filepath, 'w') as f:
+                f.write(data)
+        else:
+            save_json(data, filepath)
+    except Exception as e:
+        logger.error(f"Error saving {filepath}: {str(e)}")
+
+def clean_json_string(json_str):
+    """Clean up common JSON syntax issues"""
+    # Replace JavaScript comments with empty strings
+    cleaned = COMMENT_PATTERN.sub('', json_str)
+    
+    # Remove trailing commas (a common error in JSON)
+    cleaned = TRAILING_COMMA_OBJECT_PATTERN.sub('}', cleaned)
+    cleaned = TRAILING_COMMA_ARRAY_PATTERN.sub(']', cleaned)
+    
+    # Ensure property names are quoted
+    cleaned = UNQUOTED_KEY_PATTERN.sub(r'\1"\2"\3:\4', cleaned)
+    
+    # Replace single quotes with double quotes (another common error)
+    cleaned = SINGLE_QUOTED_PATTERN.sub(r'"\1"', cleaned)
+    
+    return cleaned
+
 def create_expertise_recommender(llm_client: OpenAIClient) -> ExpertAgent:
     """
     Create an expertise recommender agent.
@@ -50,32 +96,14 @@ and verify that all brackets and braces are properly matched.
         """Generate expertise recommendations based on validation results."""
         logger.info("Expertise Recommender processing task")
         
-        # Define clean_json_string inside the function where it's used
-        def clean_json_string(json_str):
-            """Clean up common JSON syntax issues"""
-            # Replace JavaScript comments with empty strings
-            cleaned = re.sub(r'//.*', '', json_str)
-            
-            # Remove trailing commas (a common error in JSON)
-            cleaned = re.sub(r',\s*}', '}', cleaned)
-            cleaned = re.sub(r',\s*]', ']', cleaned)
-            
-            # Ensure property names are quoted
-            cleaned = re.sub(r'(\s*)(\w+)(\s*):([^"])', r'\1"\2"\3:\4', cleaned)
-            
-            # Replace single quotes with double quotes (another common error)
-            cleaned = re.sub(r"'([^']*)'", r'"\1"', cleaned)
-            
-            return cleaned
-        
         # Get validation result from task data or context
         validation_result = task.get("data", {}).get("validation_result")
         if not validation_result:
-            # Try to find in context
+            # Try to find in context; entries are in insertion order, so keep the last
+            # Validator result seen in a single forward pass
             for context_item in task.get("context", {}).values():
                 if isinstance(context_item, dict) and context_item.get("agent_name") == "Validator":
-                    validation_result = context_item.get("result")
-                    break
+                    validation_result = context_item.get("result") or validation_result
         
         if not validation_result:
             logger.error("No validation result found")
@@ -88,14 +116,14 @@ and verify that all brackets and braces are properly matched.
         accuracy = task.get("data", {}).get("current_accuracy", validation_result.get("accuracy", 0))
         misclassified = validation_result.get("misclassified_applications", [])
         
-        # Get current ruleset
-        ruleset_file = os.path.join(RESULTS_DIR, "credit_card_approval_rules.json")
-        current_ruleset = {}
-        try:
-            with open(ruleset_file, 'r') as f:
-                current_ruleset = json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading ruleset: {str(e)}")
+        # Get current ruleset, reading the file only if the caller didn't pass it
+        current_ruleset = task.get("data", {}).get("ruleset")
+        if not current_ruleset:
+            try:
+                current_ruleset = load_json(RULESET_FILE)
+            except Exception as e:
+                logger.error(f"Error loading ruleset: {str(e)}")
+                current_ruleset = {}
         
         # Construct prompt for the LLM
         prompt = f"""
@@ -104,7 +132,7 @@ Our current accuracy is {accuracy}%, and we need to reach 100%.
 
 Current ruleset:
 ```json
-{json.dumps(current_ruleset, indent=2)}
+{json_dumps(current_ruleset, indent=False)}
 ```
 
 We currently have {len(misclassified) if isinstance(misclassified, list) else 0} misclassified applications.
@@ -143,38 +171,40 @@ Your response must be a valid JSON object with this exact structure:
         
         # Get response from LLM
         logger.info("Generating expertise recommendations with LLM")
-        llm_response = llm_client.generate(
-            prompt=prompt,
-            system_message=system_prompt,
-            temperature=0.5,  # Reduced temperature for more predictable output
-            expert_name="Expertise Recommender"
-        )
+        for max_tokens in RECOMMENDATION_MAX_TOKENS:
+            llm_response = llm_client.generate(
+                prompt=prompt,
+                system_message=system_prompt,
+                temperature=0.5,  # Reduced temperature for more predictable output
+                max_tokens=max_tokens,
+                model=RECOMMENDER_MODEL,
+                response_format={"type": "json_object"},
+                stop_after_json=True,
+                expert_name="Expertise Recommender"
+            )
+            if find_json_object(llm_response) is not None:
+                break
+            logger.warning(f"Expertise recommendations incomplete within {max_tokens} tokens")
         
         # Extract and fix JSON response
         try:
             # Try to find JSON object in response
-            match = re.search(r'\{[\s\S]*\}', llm_response)
-            json_str = match.group(0) if match else llm_response
-            
-            # Try to clean up common JSON issues before parsing
-            cleaned_json = clean_json_string(json_str)  # Now using the local function
+            json_str = find_json_object(llm_response) or llm_response
             
-            # Parse the JSON
+            # JSON mode should make the response parse as-is; the cleanup patterns can
+            # also rewrite text inside strings, so only use them on JSON that doesn't
             try:
-                recommendations = json.loads(cleaned_json)
+                recommendations = json_loads(json_str)
             except json.JSONDecodeError:
-                # Try with original if cleaning failed
-                recommendations = json.loads(json_str)
+                recommendations = json_loads(clean_json_string(json_str))
             
             # Save to file for tracking
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            recommendations_file = os.path.join(RESULTS_DIR, f"expertise_recommendations_{timestamp}.json")
-            os.makedirs(os.path.dirname(recommendations_file), exist_ok=True)
+            timestamp = time.strftime(TIMESTAMP_FORMAT)
+            recommendations_file = f"{RECOMMENDATIONS_FILE_PREFIX}{timestamp}.json"
             
-            with open(recommendations_file, 'w') as f:
-                json.dump(recommendations, f, indent=2)
+            save_record(recommendations, recommendations_file)
             
-            logger.info(f"Saved expertise recommendations to {recommendations_file}")
+            logger.info(f"Saving expertise recommendations to {recommendations_file}")
             
             return {
                 "status": "success",
@@ -203,15 +233,13 @@ Your response must be a valid JSON object with this exact structure:
             }
             
             # Save fallback recommendations
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            fallback_file = os.path.join(RESULTS_DIR, f"expertise_recommendations_fallback_{timestamp}.json")
-            with open(fallback_file, 'w') as f:
-                json.dump(fallback_recommendations, f, indent=2)
+            timestamp = time.strftime(TIMESTAMP_FORMAT)
+            fallback_file = f"{RECOMMENDATIONS_FILE_PREFIX}fallback_{timestamp}.json"
+            save_record(fallback_recommendations, fallback_file)
             
             # Also save the raw response for debugging
-            raw_file = os.path.join(RESULTS_DIR, f"expertise_recommendations_raw_{timestamp}.txt")
-            with open(raw_file, 'w') as f:
-                f.write(llm_response)
+            raw_file = f"{RECOMMENDATIONS_FILE_PREFIX}raw_{timestamp}.txt"
+            save_record(llm_response, raw_file)
             
             logger.info(f"Using fallback recommendations due to parsing error. Raw response saved to {raw_file}")
             
@@ -229,78 +257,3 @@ Your response must be a valid JSON object with this exact structure:
         behavior=expertise_recommendation_behavior,
         description="Analyzes current state and recommends new AI expert agents"
     )
-
-def process(self, task):
-    """Recommend new expertise based on task needs."""
-    self.logger.info(f"Processing task: {task.description}")
-    
-    # Find validation results if available
-    validation_results = task.data.get('validation_results', {})
-    
-    # If no validation results, look for the most recent validation task
-    if not validation_results:
-        # This would need to access tasks from meta_agent, for now use static recommendations
-        pass
-    
-    # Extract insights from validation results
-    inconsistencies = validation_results.get('inconsistencies', [])
-    suggestions = validation_results.get('suggestions', [])
-    
-    # Identify needed expertise areas
-    areas_needing_expertise = []
-    
-    for inconsistency in inconsistencies:
-        issue = inconsistency.get('issue', '').lower()
-        if 'employment status' in issue:
-            areas_needing_expertise.append('employment status evaluation')
-        if 'payment history' in issue:
-            areas_needing_expertise.append('credit history evaluation')
-    
-    for suggestion in suggestions:
-        suggestion_text = suggestion.get('suggestion', '').lower()
-        if 'employment' in suggestion_text:
-            areas_needing_expertise.append('employment status evaluation')
-        if 'payment history' in suggestion_text or 'credit history' in suggestion_text:
-            areas_needing_expertise.append('credit history evaluation')
-    
-    # If no specific areas found, add general ones
-    if not areas_needing_expertise:
-        areas_needing_expertise = ['credit risk assessment', 'rule optimization']
-    
-    # Remove duplicates
-    areas_needing_expertise = list(set(areas_needing_expertise))
-    
-    # Generate recommendations
-    recommendations = []
-    for area in areas_needing_expertise:
-        agent_name = f"{area.replace(' ', '_').title()}_Expert"
-        capabilities = [area, 'rule_refinement']
-        
-        system_prompt = f"""You are an expert in {area} for credit card applications.
-        Your role is to evaluate applications specifically focusing on {area} aspects and provide
-        specialized insights that can improve approval rules and decision-making.
-        
-        When asked to refine rules, suggest specific adjustments that improve accuracy
-        without compromising risk management principles.
-        """
-        
-        recommendations.append({
-            "agent_name": agent_name,
-            "capabilities": capabilities,
-            "system_prompt": system_prompt,
-            "rationale": f"Created to address inconsistencies in {area}"
-        })
-    
-    # Save recommendations
-    timestamp = int(time.time())
-    feedback_iteration = task.data.get('feedback_iteration', 1)
-    recommendation_file = os.path.join(RESULTS_DIR, f'expertise_recommendations_iteration_{feedback_iteration}.json')
-    with open(recommendation_file, 'w') as f:
-        json.dump(recommendations, f, indent=2)
-    
-    return {
-        "status": "success",
-        "recommendations": recommendations,
-        "recommendation_file": recommendation_file,
-        "message": f"Generated {len(recommendations)} expertise recommendations"
-    }
\ No newline at end of file
@@ -1,12 +1,31 @@
-import json
 import os
+import numpy as np
+from collections import defaultdict, namedtuple
 from typing import Dict, Any, List
 from meta_agent_system.utils.logger import get_logger
+from meta_agent_system.utils.helpers import load_json, save_json, json_loads, load_application_records
 from meta_agent_system.config.settings import APPLICATIONS_DIR, RESULTS_DIR
 from meta_agent_system.llm.openai_client import OpenAIClient
 
 logger = get_logger(__name__)
 
+# Input and output files, resolved once at import time
+VALIDATION_DIAGNOSTICS_FILE = os.path.join(RESULTS_DIR, "validation_diagnostics.json")
+PERSISTENT_MISCLASSIFICATIONS_FILE = os.path.join(RESULTS_DIR, "persistent_misclassifications.json")
+DETAILED_ANALYSIS_FILE = os.path.join(RESULTS_DIR, "detailed_misclassification_analysis.json")
+
+# Application fields compared between applications, flattened out of the nested record
+AppFeatures = namedtuple("AppFeatures", "credit_tier payment_history income_tier debt_tier")
+
+# Similarity weights in tenths for credit tier, payment history, income tier and debt tier
+SIMILARITY_WEIGHTS = np.array([3, 2, 3, 2])
+SIMILARITY_THRESHOLD = 5
+
+# Persistent misclassifications analyzed per LLM request, and the response tokens allowed for each
+LLM_ANALYSIS_BATCH_SIZE = 5
+LLM_ANALYSIS_MAX_TOKENS = 800
+LLM_ANALYSIS_SYSTEM_MESSAGE = "You are a Credit Card Approval Expert that helps identify patterns and recommends rule improvements."
+
 def analyze_misclassifications(llm_client=None):
     """Analyze misclassified applications in depth to provide targeted feedback"""
     # Initialize OpenAI client if not passed in
@@ -14,103 +33,96 @@ def analyze_misclassifications(llm_client=None):
         llm_client = OpenAIClient()
     
     # Load necessary data
-    with open(os.path.join(RESULTS_DIR, "validation_diagnostics.json"), 'r') as f:
-        diagnostics = json.load(f)
+    diagnostics = load_json(VALIDATION_DIAGNOSTICS_FILE)
     
-    with open(os.path.join(RESULTS_DIR, "persistent_misclassifications.json"), 'r') as f:
-        persistent_misclassifications = json.load(f)
+    persistent_misclassifications = load_json(PERSISTENT_MISCLASSIFICATIONS_FILE)
     
-    # Get applications from files
-    applications = []
-    application_files = [f for f in os.listdir(APPLICATIONS_DIR) 
-                       if f.startswith("application_") and f.endswith(".json")]
+    # Get applications with their IDs, kept alongside so the application records are never modified
+    records = load_application_records(APPLICATIONS_DIR)
+    applications = [app for _, app in records]
+    numeric_ids = [app_id for app_id, _ in records]
+    app_ids = [str(app_id) for app_id in numeric_ids]
     
-    for f in application_files:
-        app_id = f.replace("application_", "").replace(".json", "")
-        with open(os.path.join(APPLICATIONS_DIR, f), 'r') as file:
-            app = json.load(file)
-            app["id"] = app_id
-            applications.append(app)
+    # Index application positions by ID for quick lookup
+    app_positions = {app_id: position for position, app_id in enumerate(app_ids)}
     
-    # Index applications by ID for quick lookup
-    app_dict = {app["id"]: app for app in applications}
+    # Flatten each application's similarity features once, then encode them as
+    # small integers, one column per feature
+    app_features = [similarity_features(app) for app in applications]
+    feature_encodings = [{} for _ in SIMILARITY_WEIGHTS]
+    feature_codes = np.array([
+        [encoding.setdefault(value, len(encoding)) for encoding, value in zip(feature_encodings, features)]
+        for features in app_features
+    ], dtype=np.int32).reshape(len(applications), len(SIMILARITY_WEIGHTS))
     
     # Get the rule evaluations
     rule_evaluations = diagnostics.get("rule_evaluations", [])
     ruleset = diagnostics.get("ruleset", {})
     
+    # Index evaluations by application ID, keeping the first one like a linear search would
+    eval_by_id = {}
+    for rule_eval in rule_evaluations:
+        eval_by_id.setdefault(rule_eval.get("application_id"), rule_eval)
+    
+    # Group the positions of correctly classified applications by their expected outcome
+    correct_positions = defaultdict(list)
+    for position, other_id in enumerate(numeric_ids):
+        other_eval = eval_by_id.get(other_id)
+        if other_eval and other_eval.get("correct"):
+            correct_positions[other_eval.get("expected")].append(position)
+    correct_positions = {expected: np.array(positions) for expected, positions in correct_positions.items()}
+    
     # Identify incorrect evaluations
     incorrect_evaluations = [eval for eval in rule_evaluations if not eval.get("correct", False)]
     
     # Detailed analysis of each misclassified application
     detailed_analysis = []
     
+    # Analyses waiting for an LLM explanation, grouped by their application details
+    pending_llm_analyses = {}
+    
     for eval in incorrect_evaluations:
         app_id = str(eval.get("application_id"))
-        app = app_dict.get(app_id)
+        position = app_positions.get(app_id)
         
-        if not app:
+        if position is None:
             continue
+        app = applications[position]
             
         # Get application details
-        credit_tier = app["creditHistory"]["creditTier"]
-        payment_history = app["creditHistory"]["paymentHistory"]
-        income_tier = app["financialInformation"]["incomeTier"]
-        debt_tier = app["financialInformation"]["debtTier"]
+        credit_tier, payment_history, income_tier, debt_tier = app_features[position]
         employment = app["financialInformation"]["employmentStatus"]
         
         # Get rule evaluation details
         rule_evals = eval.get("rule_evaluations", [])
         
-        # Determine why this application was misclassified
-        rules_failed = []
-        rules_passed = []
-        
-        for rule_eval in rule_evals:
-            if rule_eval.get("passed", False):
-                rules_passed.append(rule_eval)
-            else:
-                rules_failed.append(rule_eval)
+        # Determine why this application was misclassified; passed rules are only counted
+        rules_failed = [rule_eval for rule_eval in rule_evals if not rule_eval.get("passed", False)]
+        rules_passed_count = len(rule_evals) - len(rules_failed)
         
         # Find similar applications that were correctly classified
         expected_approval = eval.get("expected")
-        similar_apps = []
+        candidates = correct_positions.get(expected_approval, np.empty(0, dtype=int))
+        candidates = candidates[candidates != position]
         
-        for other_app in applications:
-            if other_app["id"] == app_id:
-                continue
-                
-            # Check if this app has similar characteristics
-            other_credit_tier = other_app["creditHistory"]["creditTier"]
-            other_payment_history = other_app["creditHistory"]["paymentHistory"]
-            other_income_tier = other_app["financialInformation"]["incomeTier"]
-            other_debt_tier = other_app["financialInformation"]["debtTier"]
-            
-            # Calculate similarity score (simple version)
-            similarity_score = 0
-            if credit_tier == other_credit_tier:
-                similarity_score += 0.3
-            if payment_history == other_payment_history:
-                similarity_score += 0.2
-            if income_tier == other_income_tier:
-                similarity_score += 0.3
-            if debt_tier == other_debt_tier:
-                similarity_score += 0.2
-            
-            # Find correct classifications with high similarity
-            other_eval = next((e for e in rule_evaluations if e.get("application_id") == int(other_app["id"])), None)
-            if other_eval and other_eval.get("correct") and other_eval.get("expected") == expected_approval and similarity_score > 0.5:
-                similar_apps.append({
-                    "id": other_app["id"],
-                    "credit_tier": other_credit_tier,
-                    "payment_history": other_payment_history, 
-                    "income_tier": other_income_tier,
-                    "debt_tier": other_debt_tier,
-                    "similarity_score": similarity_score
-                })
+        # Score every candidate at once and keep those with high similarity
+        scores = (feature_codes[candidates] == feature_codes[position]) @ SIMILARITY_WEIGHTS
+        similar = scores > SIMILARITY_THRESHOLD
+        candidates, scores = candidates[similar], scores[similar]
         
-        # Sort similar apps by similarity score
-        similar_apps = sorted(similar_apps, key=lambda x: x["similarity_score"], reverse=True)[:3]
+        # Take the top 3 by similarity score, ties in application order
+        top = np.argsort(-scores, kind="stable")[:3]
+        similar_apps = []
+        for other_position, score in zip(candidates[top], scores[top]):
+            other_features = app_features[other_position]
+            similar_apps.append({
+                "id": app_ids[other_position],
+                "credit_tier": other_features.credit_tier,
+                "payment_history": other_features.payment_history, 
+                "income_tier": other_features.income_tier,
+                "debt_tier": other_features.debt_tier,
+                "similarity_score": int(score) / 10
+            })
         
         # Create detailed analysis for this application
         analysis = {
@@ -126,7 +138,7 @@ def analyze_misclassifications(llm_client=None):
             },
             "rule_analysis": {
                 "rules_failed": len(rules_failed),
-                "rules_passed": len(rules_passed),
+                "rules_passed": rules_passed_count,
                 "reason": generate_failure_reason(app, rules_failed, ruleset)
             },
             "similar_correctly_classified": similar_apps,
@@ -134,55 +146,108 @@ def analyze_misclassifications(llm_client=None):
         }
         
         # Add persistence information
-        if app_id in persistent_misclassifications:
+        persistence = persistent_misclassifications.get(app_id)
+        misclassification_count = 0
+        if persistence is not None:
+            misclassification_count = persistence.get("misclassification_count", 0)
             analysis["persistence"] = {
-                "count": persistent_misclassifications[app_id].get("misclassification_count", 0),
-                "iterations": persistent_misclassifications[app_id].get("iterations", [])
+                "count": misclassification_count,
+                "iterations": persistence.get("iterations", [])
             }
         
-        # Get deeper LLM analysis if significant misclassification
-        if app_id in persistent_misclassifications and persistent_misclassifications[app_id].get("misclassification_count", 0) > 1:
-            # Create a prompt for the LLM
-            prompt = f"""
-            I need a detailed analysis of why this credit card application is being misclassified.
-            
-            Application details:
-            - Credit tier: {credit_tier}
-            - Payment history: {payment_history}
-            - Income tier: {income_tier}
-            - Debt tier: {debt_tier}
-            - Employment: {employment}
-            
-            This application is being persistently misclassified. It should be {analysis['expected']} but is being {analysis['actual']}.
-            
-            Rule analysis:
-            - Rules failed: {len(rules_failed)}
-            - Rules passed: {len(rules_passed)}
-            
-            Please provide a detailed explanation of potential rule improvements that could fix this misclassification.
-            """
-            
-            system_message = "You are a Credit Card Approval Expert that helps identify patterns and recommends rule improvements."
-            
-            # Get LLM analysis
-            llm_analysis = llm_client.generate(
-                prompt=prompt,
-                system_message=system_message,
-                temperature=0.3,
-                expert_name="Misclassification Analyzer"
-            )
-            
-            # Add LLM analysis to the detailed analysis
-            analysis["llm_analysis"] = llm_analysis
+        # Queue deeper LLM analysis if significant misclassification
+        if misclassification_count > 1:
+            details = f"""
+- Credit tier: {credit_tier}
+- Payment history: {payment_history}
+- Income tier: {income_tier}
+- Debt tier: {debt_tier}
+- Employment: {employment}
+- Should be {analysis['expected']} but is being {analysis['actual']}
+- Rules failed: {len(rules_failed)}
+- Rules passed: {rules_passed_count}
+"""
+            pending_llm_analyses.setdefault(details, []).append(analysis)
         
         detailed_analysis.append(analysis)
     
+    # Get the LLM analyses, asking once per distinct set of details
+    if pending_llm_analyses:
+        llm_analyses = request_llm_analyses(llm_client, list(pending_llm_analyses))
+        for details, analyses in pending_llm_analyses.items():
+            if details in llm_analyses:
+                for analysis in analyses:
+                    analysis["llm_analysis"] = llm_analyses[details]
+    
     # Save detailed analysis
-    with open(os.path.join(RESULTS_DIR, "detailed_misclassification_analysis.json"), 'w') as f:
-        json.dump(detailed_analysis, f, indent=2)
+    save_json(detailed_analysis, DETAILED_ANALYSIS_FILE)
     
     return detailed_analysis
 
+def request_llm_analyses(llm_client, details_list):
+    """Get an LLM analysis for each set of application details, several applications per request"""
+    analyses = {}
+    missing = []
+    for start in range(0, len(details_list), LLM_ANALYSIS_BATCH_SIZE):
+        batch = details_list[start:start + LLM_ANALYSIS_BATCH_SIZE]
+        batch_analyses = request_llm_analysis_batch(llm_client, batch)
+        analyses.update(batch_analyses)
+        missing.extend(details for details in batch if details not in batch_analyses)
+    
+    # Details the JSON reply gave no explanation for (unparseable, cut off at the token
+    # limit, or numbers skipped) are asked about alone, where plain text is accepted too
+    if missing:
+        logger.info(f"Retrying LLM analysis for {len(missing)} misclassified applications individually")
+        for details in missing:
+            analyses.update(request_llm_analysis_batch(llm_client, [details]))
+    
+    return analyses
+
+def request_llm_analysis_batch(llm_client, batch):
+    """Ask the LLM to analyze a batch of persistently misclassified applications, returning analyses by details"""
+    parts = ["""
+I need a detailed analysis of why each of these credit card applications is being persistently misclassified.
+"""]
+    for number, details in enumerate(batch, start=1):
+        parts.append(f"\nApplication {number}:{details}")
+    parts.append("""
+For each application, provide a detailed explanation of potential rule improvements that could fix its misclassification.
+Respond with a JSON object mapping each application number to its explanation, like {"1": "...", "2": "..."}.
+""")
+    
+    response = llm_client.generate(
+        prompt="".join(parts),
+        system_message=LLM_ANALYSIS_SYSTEM_MESSAGE,
+        temperature=0.3,
+        max_tokens=LLM_ANALYSIS_MAX_TOKENS * len(batch),
+        response_format={"type": "json_object"},
+        expert_name="Misclassification Analyzer"
+    )
+    
+    try:
+        by_number = json_loads(response)
+    except Exception:
+        by_number = None
+    if not isinstance(by_number, dict):
+        by_number = {}
+    
+    analyses = {details: by_number[str(number)] for number, details in enumerate(batch, start=1) if by_number.get(str(number))}
+    
+    # A lone application's reply is still useful as plain text
+    if len(batch) == 1 and not analyses:
+        analyses[batch[0]] = response
+    
+    return analyses
+
+def similarity_features(app):
+    """Get the credit tier, payment history, income tier and debt tier used to compare applications"""
+    return AppFeatures(
+        app["creditHistory"]["creditTier"],
+        app["creditHistory"]["paymentHistory"],
+        app["financialInformation"]["incomeTier"],
+        app["financialInformation"]["debtTier"]
+    )
+
 def generate_failure_reason(app, failed_rules, ruleset):
     """Generate an explanation of why the rules failed for this application"""
     if not failed_rules:
@@ -1,13 +1,44 @@
 from typing import Dict, Any
 import json
 import os
+import hashlib
+import numpy as np
 from meta_agent_system.core.expert_agent import ExpertAgent
-from meta_agent_system.llm.openai_client import OpenAIClient
+from meta_agent_system.core.expert_memory import ExpertMemory
+from meta_agent_system.llm.openai_client import OpenAIClient, is_error_response
 from meta_agent_system.utils.logger import get_logger
-from meta_agent_system.config.settings import APPLICATIONS_DIR, RESULTS_DIR
+from meta_agent_system.utils.helpers import load_json, save_json, load_applications
+from meta_agent_system.config.settings import APPLICATIONS_DIR, RESULTS_DIR, LLM_CACHE
 
 logger = get_logger(__name__)
 
+# LLM analyses keyed by the structure of their inputs; only used with the opt-in LLM cache
+ANALYSIS_CACHE_FILE = os.path.join(RESULTS_DIR, "analysis_cache.json")
+ANALYSIS_CACHE_MAX_ENTRIES = 500
+
+# Analyses remembered per application schema, and how they affected accuracy
+EXPERT_MEMORY_FILE = os.path.join(RESULTS_DIR, "expert_memory.jsonl")
+MEMORY_PASS_THRESHOLD = 0.7
+MEMORY_OUTLINE_LENGTH = 1500
+
+# Bucket sizes for the averages in the structural analysis cache key
+CREDIT_SCORE_BUCKET = 10
+AMOUNT_BUCKET = 1000
+
+# Input and output files, resolved once at import time
+HIDDEN_APPROVALS_FILE = os.path.join(APPLICATIONS_DIR, "hidden_approvals.json")
+VALIDATION_DIAGNOSTICS_FILE = os.path.join(RESULTS_DIR, "validation_diagnostics.json")
+VALIDATION_RESULTS_FILE = os.path.join(RESULTS_DIR, "validation_results.json")
+ANALYSIS_JSON_FILE = os.path.join(RESULTS_DIR, "credit_card_analysis.json")
+ANALYSIS_TEXT_FILE = os.path.join(RESULTS_DIR, "credit_card_analysis.txt")
+
+# Numeric fields analyzed column-wise, as column name -> (section, field)
+COLUMN_FIELDS = {
+    "credit_score": ("creditHistory", "creditScore"),
+    "annual_income": ("financialInformation", "annualIncome"),
+    "existing_debt": ("financialInformation", "existingDebt")
+}
+
 def create_rule_analyzer(llm_client: OpenAIClient) -> ExpertAgent:
     """Create a rule analysis expert agent."""
     system_prompt = """
@@ -27,23 +58,74 @@ Focus on identifying:
         logger.info("Starting pattern analysis")
         
         # Load data
-        data = load_data()
+        data = load_data(task.get("data", {}).get("applications"))
+        
+        # Search single-field thresholds locally, then create analysis text for LLM
+        columns, approved = application_columns(data)
+        thresholds = find_thresholds(columns, approved)
+        # Group averages feed both the prompt statistics and the analysis cache key
+        averages = {
+            "approved": group_averages(columns, approved),
+            "declined": group_averages(columns, ~approved)
+        }
+        analysis_prompt = create_analysis_prompt(data, columns, approved, averages, thresholds)
         
-        # Create analysis text for LLM
-        analysis_prompt = create_analysis_prompt(data)
+        # Score the analysis from the previous run against the current accuracy, and
+        # lead with the last analysis that helped if it usually does
+        memory = ExpertMemory(EXPERT_MEMORY_FILE)
+        schema_hash = application_schema_hash(data["applications"])
+        accuracy = data["accuracy"]
+        outline = None
+        if schema_hash and accuracy is not None:
+            memory.record_outcome(schema_hash, accuracy)
+            entry = memory.get(schema_hash)
+            if entry and entry.content and entry.pass_rate() > MEMORY_PASS_THRESHOLD:
+                logger.info(f"Including a previous analysis that helped {entry.pass_rate():.0%} of the time")
+                outline = entry.content
+                analysis_prompt = f"""
+## Previously Successful Analysis Outline
+{outline}
+""" + analysis_prompt
         
-        # Get LLM analysis
+        # Get LLM analysis; with the LLM cache enabled, reuse an earlier one if the data is structurally the same
         try:
-            logger.info("Requesting pattern analysis from LLM")
-            llm_response = llm_client.generate(
-                prompt=analysis_prompt,
-                system_message=system_prompt,
-                temperature=0.3,
-                expert_name="Rule Analyzer"
-            )
+            cache = None
+            llm_response = None
+            if LLM_CACHE:
+                cache = load_analysis_cache()
+                cache_key = structural_analysis_key(data, approved, averages, schema_hash, outline)
+                llm_response = cache.pop(cache_key, None)
+                # Older caches may hold a failed request; ask again instead of replaying it
+                if llm_response is not None and is_error_response(llm_response):
+                    llm_response = None
+            
+            if llm_response is None:
+                logger.info("Requesting pattern analysis from LLM")
+                llm_response = llm_client.generate(
+                    prompt=analysis_prompt,
+                    system_message=system_prompt,
+                    temperature=0.3,
+                    expert_name="Rule Analyzer"
+                )
+            else:
+                logger.info("Reusing cached pattern analysis for structurally identical data")
+            
+            # generate() returns failures as text; don't let one be reused as an analysis
+            analysis_failed = is_error_response(llm_response)
+            
+            # (Re)insert at the end so the most recently used analyses are the last to be evicted
+            if cache is not None and not analysis_failed:
+                cache[cache_key] = llm_response
+                save_analysis_cache(cache)
             
             # Save analysis results
-            save_analysis_results(llm_response)
+            save_analysis_results(llm_response, thresholds)
+            
+            # Remember this analysis so the next run can tell whether it helped; a failed
+            # request isn't an analysis and must never become a remembered outline
+            if schema_hash and accuracy is not None and not analysis_failed:
+                memory.record_candidate(schema_hash, llm_response[:MEMORY_OUTLINE_LENGTH], accuracy)
+                memory.save()
             
             return {
                 "status": "success",
@@ -56,33 +138,18 @@ Focus on identifying:
                 "message": f"Error analyzing patterns: {str(e)}"
             }
     
-    def load_data():
-        """Load all necessary data in one function"""
+    def load_data(applications=None):
+        """Load all necessary data in one function, reusing applications if given"""
         data = {}
         
-        # Load applications
-        applications = []
-        if os.path.exists(APPLICATIONS_DIR):
-            app_files = [f for f in os.listdir(APPLICATIONS_DIR) 
-                        if f.startswith("application_") and f.endswith(".json")]
-            
-            for f in app_files:
-                file_path = os.path.join(APPLICATIONS_DIR, f)
-                try:
-                    with open(file_path, 'r') as file:
-                        applications.append(json.load(file))
-                except Exception as e:
-                    logger.error(f"Error loading application: {str(e)}")
-        
-        data["applications"] = applications
+        # Load applications in ID order; hidden approvals are keyed by it
+        data["applications"] = load_applications(APPLICATIONS_DIR, applications)
         
         # Load hidden approvals
         hidden_approvals = {}
-        file_path = os.path.join(APPLICATIONS_DIR, "hidden_approvals.json")
-        if os.path.exists(file_path):
+        if os.path.exists(HIDDEN_APPROVALS_FILE):
             try:
-                with open(file_path, 'r') as f:
-                    hidden_approvals = json.load(f)
+                hidden_approvals = load_json(HIDDEN_APPROVALS_FILE)
             except Exception as e:
                 logger.error(f"Error loading hidden approvals: {str(e)}")
         
@@ -90,35 +157,141 @@ Focus on identifying:
         
         # Load validation diagnostics
         diagnostics = {}
-        diagnostics_file = os.path.join(RESULTS_DIR, "validation_diagnostics.json")
-        if os.path.exists(diagnostics_file):
+        if os.path.exists(VALIDATION_DIAGNOSTICS_FILE):
             try:
-                with open(diagnostics_file, 'r') as f:
-                    diagnostics = json.load(f)
+                diagnostics = load_json(VALIDATION_DIAGNOSTICS_FILE)
             except Exception:
                 pass
                 
         data["diagnostics"] = diagnostics
         
+        # Load the accuracy of the current ruleset
+        data["accuracy"] = None
+        if os.path.exists(VALIDATION_RESULTS_FILE):
+            try:
+                data["accuracy"] = load_json(VALIDATION_RESULTS_FILE).get("accuracy")
+            except Exception:
+                pass
+        
         return data
     
-    def create_analysis_prompt(data):
-        """Create a prompt for pattern analysis"""
+    def application_schema_hash(applications):
+        """Hash the top-level fields of the applications, or None if there are none"""
+        if not applications:
+            return None
+        fields = json.dumps(sorted(applications[0].keys()))
+        return hashlib.blake2b(fields.encode("utf-8"), digest_size=8).hexdigest()
+    
+    def structural_analysis_key(data, approved, averages, schema_hash, outline):
+        """
+        Key an analysis by the structure of its inputs rather than the exact prompt text:
+        schema, group sizes, bucketed group averages, misclassifications and any outline
+        """
+        misclassified = sorted(
+            (str(eval.get("application_id")), bool(eval.get("expected")), bool(eval.get("actual")))
+            for eval in data["diagnostics"].get("rule_evaluations", [])
+            if not eval.get("correct", True)
+        )
+        
+        structure = {
+            "system_prompt": system_prompt,
+            "schema": schema_hash,
+            "approved": [int(approved.sum()), bucket_averages(averages["approved"])],
+            "declined": [int((~approved).sum()), bucket_averages(averages["declined"])],
+            "misclassified": misclassified,
+            "outline": outline
+        }
+        return hashlib.blake2b(json.dumps(structure, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+    
+    def bucket_averages(averages):
+        """Group averages rounded to buckets, so insignificant differences share a key"""
+        return [
+            round(averages["credit_score"] / CREDIT_SCORE_BUCKET),
+            round(averages["annual_income"] / AMOUNT_BUCKET),
+            round(averages["existing_debt"] / AMOUNT_BUCKET)
+        ]
+    
+    def application_columns(data):
+        """
+        Convert the applications into one float array per analyzed field, with NaN for
+        missing or zero values, plus a boolean mask of the approved applications
+        """
         applications = data["applications"]
         hidden_approvals = data["hidden_approvals"]
+        
+        columns = {
+            name: np.array([app.get(section, {}).get(field) or np.nan for app in applications], dtype=float)
+            for name, (section, field) in COLUMN_FIELDS.items()
+        }
+        approved = np.array([bool(hidden_approvals.get(str(idx + 1), False)) for idx in range(len(applications))], dtype=bool)
+        return columns, approved
+    
+    def find_thresholds(columns, approved):
+        """
+        For each field, find the cut-off that best separates approved from declined
+        applications on its own, trying every midpoint between observed values at once
+        in O(N log N) time and O(N) memory
+        """
+        thresholds = []
+        if approved.all() or not approved.any():
+            return thresholds
+        
+        for name, values in columns.items():
+            present = ~np.isnan(values)
+            field_values = values[present]
+            labels = approved[present]
+            unique_values, value_index = np.unique(field_values, return_inverse=True)
+            if unique_values.size < 2:
+                continue
+            
+            # Approved and declined counts at each distinct value, in sorted order
+            approved_counts = np.bincount(value_index[labels], minlength=unique_values.size)
+            declined_counts = np.bincount(value_index[~labels], minlength=unique_values.size)
+            
+            # Each candidate cut-off lies between two neighbouring values, so approving above it
+            # is right for the approved applications above and the declined ones at or below
+            candidates = (unique_values[:-1] + unique_values[1:]) / 2
+            approved_above = approved_counts.sum() - np.cumsum(approved_counts)[:-1]
+            declined_at_or_below = np.cumsum(declined_counts)[:-1]
+            above_correct = (approved_above + declined_at_or_below) / field_values.size
+            
+            # Approving below the cut-off is right exactly where approving above it is wrong
+            best_above = int(above_correct.argmax())
+            best_below = int(above_correct.argmin())
+            if above_correct[best_above] >= 1 - above_correct[best_below]:
+                direction, index, accuracy = "greater_than", best_above, above_correct[best_above]
+            else:
+                direction, index, accuracy = "less_than", best_below, 1 - above_correct[best_below]
+            
+            thresholds.append({
+                "field": name,
+                "condition": direction,
+                "threshold": round(float(candidates[index]), 2),
+                "accuracy": round(float(accuracy) * 100, 1)
+            })
+        
+        thresholds.sort(key=lambda hint: hint["accuracy"], reverse=True)
+        return thresholds
+    
+    def format_thresholds(thresholds):
+        """Format threshold hints for the analysis prompt"""
+        if not thresholds:
+            return "No single-field thresholds available"
+        
+        return "\n".join(
+            f"- Approve when {hint['field']} {hint['condition']} {hint['threshold']}: "
+            f"{hint['accuracy']}% of applications classified correctly"
+            for hint in thresholds
+        )
+    
+    def create_analysis_prompt(data, columns, approved, averages, thresholds):
+        """Create a prompt for pattern analysis"""
+        applications = data["applications"]
         diagnostics = data["diagnostics"]
         
         # Separate applications
-        approved_apps = []
-        declined_apps = []
-        
-        for idx, app in enumerate(applications):
-            app_id = idx + 1
-            key = str(app_id)
-            if hidden_approvals.get(key, False):
-                approved_apps.append(app)
-            else:
-                declined_apps.append(app)
+        approved_count = int(approved.sum())
+        declined_count = len(applications) - approved_count
         
         # Extract misclassified applications
         misclassified = []
@@ -132,16 +305,16 @@ Focus on identifying:
                 })
         
         # Calculate application statistics
-        approved_stats = calculate_stats(approved_apps)
-        declined_stats = calculate_stats(declined_apps)
+        approved_stats = calculate_stats(columns, approved, averages["approved"])
+        declined_stats = calculate_stats(columns, ~approved, averages["declined"])
         
         return f"""
 # Credit Card Application Pattern Analysis
 
 ## Dataset Overview
 - Total Applications: {len(applications)}
-- Approved: {len(approved_apps)} applications
-- Declined: {len(declined_apps)} applications
+- Approved: {approved_count} applications
+- Declined: {declined_count} applications
 
 ## Approved Applications Statistics
 {approved_stats}
@@ -149,6 +322,9 @@ Focus on identifying:
 ## Declined Applications Statistics
 {declined_stats}
 
+## Best Single-Field Thresholds
+{format_thresholds(thresholds)}
+
 ## Misclassified Applications ({len(misclassified)})
 {format_misclassified(misclassified[:5])}
 
@@ -165,31 +341,39 @@ Focus on finding clear rules that can be used to classify applications accuratel
 Provide actionable insights that can be used to create better credit card approval rules.
 """
     
-    def calculate_stats(applications):
-        """Calculate statistics for a set of applications"""
-        if not applications:
+    def group_averages(columns, mask):
+        """Average of each field over the selected applications, ignoring missing values"""
+        averages = {}
+        for name, values in columns.items():
+            selected = values[mask]
+            selected = selected[~np.isnan(selected)]
+            averages[name] = float(selected.mean()) if selected.size else 0
+        return averages
+    
+    def calculate_stats(columns, mask, averages):
+        """Calculate statistics for the applications selected by mask, given their group averages"""
+        if not mask.any():
             return "No applications available"
         
-        credit_scores = [app.get("creditHistory", {}).get("creditScore", 0) for app in applications]
-        incomes = [app.get("financialInformation", {}).get("annualIncome", 0) for app in applications]
-        debts = [app.get("financialInformation", {}).get("existingDebt", 0) for app in applications]
-        
-        # Filter out missing values
-        credit_scores = [s for s in credit_scores if s]
-        incomes = [i for i in incomes if i]
-        debts = [d for d in debts if d]
+        avg_credit = averages["credit_score"]
+        avg_income = averages["annual_income"]
+        avg_debt = averages["existing_debt"]
         
-        # Calculate averages
-        avg_credit = sum(credit_scores) / len(credit_scores) if credit_scores else 0
-        avg_income = sum(incomes) / len(incomes) if incomes else 0
-        avg_debt = sum(debts) / len(debts) if debts else 0
+        # 10th and 90th percentiles show the spread that averages hide
+        ranges = []
+        for name, label in (("credit_score", "Credit Score"), ("annual_income", "Annual Income"), ("existing_debt", "Existing Debt")):
+            selected = columns[name][mask]
+            selected = selected[~np.isnan(selected)]
+            if selected.size:
+                low, high = np.quantile(selected, [0.1, 0.9])
+                ranges.append(f"- {label} 10th-90th Percentile: {low:.0f} to {high:.0f}")
         
         return f"""
 - Average Credit Score: {avg_credit:.1f}
 - Average Annual Income: ${avg_income:.2f}
 - Average Existing Debt: ${avg_debt:.2f}
 - Debt-to-Income Ratio: {(avg_debt / avg_income if avg_income else 0):.2f}
-"""
+""" + "\n".join(ranges) + ("\n" if ranges else "")
     
     def format_misclassified(misclassified):
         """Format misclassified applications for analysis"""
@@ -211,19 +395,34 @@ Application #{app.get('id')}: Should be {app.get('expected')} but was {app.get('
         
         return "\n".join(formatted)
     
-    def save_analysis_results(analysis):
+    def load_analysis_cache():
+        """Load earlier analyses keyed by structural analysis key"""
+        try:
+            return load_json(ANALYSIS_CACHE_FILE)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+    
+    def save_analysis_cache(cache):
+        """Persist analyses so later runs on the same data can reuse them"""
+        # Drop the least recently used entries once the cache outgrows its limit
+        if len(cache) > ANALYSIS_CACHE_MAX_ENTRIES:
+            cache = dict(list(cache.items())[-ANALYSIS_CACHE_MAX_ENTRIES:])
+        
+        try:
+            save_json(cache, ANALYSIS_CACHE_FILE, indent=False)
+        except Exception as e:
+            logger.warning(f"Could not save analysis cache: {str(e)}")
+    
+    def save_analysis_results(analysis, thresholds):
         """Save analysis results to files"""
         # Save full analysis
-        analysis_file = os.path.join(RESULTS_DIR, "credit_card_analysis.json")
-        with open(analysis_file, 'w') as f:
-            json.dump({"analysis": analysis}, f, indent=2)
+        save_json({"analysis": analysis, "thresholds": thresholds}, ANALYSIS_JSON_FILE)
         
         # Save readable text version
-        text_file = os.path.join(RESULTS_DIR, "credit_card_analysis.txt")
-        with open(text_file, 'w') as f:
+        with open(ANALYSIS_TEXT_FILE, 'w') as f:
             f.write(analysis)
         
-        logger.info(f"Saved analysis results to {analysis_file} and {text_file}")
+        logger.info(f"Saved analysis results to {ANALYSIS_JSON_FILE} and {ANALYSIS_TEXT_FILE}")
     
     # Create and return the expert agent
     return ExpertAgent(
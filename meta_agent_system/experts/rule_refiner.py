@@ -6,10 +6,20 @@ import time
 from meta_agent_system.core.expert_agent import ExpertAgent
 from meta_agent_system.llm.openai_client import OpenAIClient
 from meta_agent_system.utils.logger import get_logger
+from meta_agent_system.utils.helpers import load_json, json_dumps, json_loads, load_applications, find_json_object
 from meta_agent_system.config.settings import APPLICATIONS_DIR, RESULTS_DIR
 
 logger = get_logger(__name__)
 
+# Patterns for repairing JSON in LLM responses, compiled once
+COMMENT_PATTERN = re.compile(r'//.*')
+UNQUOTED_KEY_PATTERN = re.compile(r'([{,])\s*(\w+):')
+
+# Input and output files, resolved once at import time
+RULESET_FILE = os.path.join(RESULTS_DIR, "credit_card_approval_rules.json")
+VALIDATION_DIAGNOSTICS_FILE = os.path.join(RESULTS_DIR, "validation_diagnostics.json")
+HIDDEN_APPROVALS_FILE = os.path.join(APPLICATIONS_DIR, "hidden_approvals.json")
+
 def create_rule_refiner(llm_client: OpenAIClient) -> ExpertAgent:
     """Create a rule refinement expert agent that learns from examples."""
     system_prompt = """
@@ -40,7 +50,7 @@ Look for SIMPLE, CLEAR PATTERNS in the data!
         expert_insights = task.get("data", {}).get("expert_insights", [])
         
         # Load data
-        data = load_required_data()
+        data = load_required_data(task.get("data", {}).get("applications"), task.get("data", {}).get("ruleset"))
         
         # Process data to find examples
         examples = categorize_applications(data)
@@ -61,7 +71,9 @@ Look for SIMPLE, CLEAR PATTERNS in the data!
             prompt=prompt,
             system_message=system_prompt,
             temperature=0.2,
-            use_cache=False,
+            cache_key_extra={"iteration": iteration},
+            response_format={"type": "json_object"},
+            stop_after_json=True,
             expert_name="Rule Refiner"
         )
         
@@ -95,43 +107,31 @@ Look for SIMPLE, CLEAR PATTERNS in the data!
                 "message": f"Used fallback ruleset due to error: {str(e)}"
             }
     
-    def load_required_data():
-        """Load all required data files in one function."""
+    def load_required_data(applications=None, ruleset=None):
+        """Load all required data files in one function, reusing applications and ruleset if given."""
         data = {}
         
         # Load applications
-        applications = []
-        app_files = [f for f in os.listdir(APPLICATIONS_DIR) 
-                    if f.startswith("application_") and f.endswith(".json")]
-        app_files.sort(key=lambda f: int(f.replace("application_", "").replace(".json", "")))
+        data["applications"] = load_applications(APPLICATIONS_DIR, applications)
         
-        for f in app_files:
+        # Use the caller's ruleset, otherwise load the saved one
+        if ruleset is not None:
+            data["ruleset"] = ruleset
+        else:
             try:
-                with open(os.path.join(APPLICATIONS_DIR, f), 'r') as file:
-                    applications.append(json.load(file))
-            except Exception as e:
-                logger.error(f"Error loading {f}: {str(e)}")
-        
-        data["applications"] = applications
-        
-        # Load ruleset
-        try:
-            with open(os.path.join(RESULTS_DIR, "credit_card_approval_rules.json"), 'r') as f:
-                data["ruleset"] = json.load(f)
-        except Exception:
-            data["ruleset"] = {}
+                data["ruleset"] = load_json(RULESET_FILE)
+            except Exception:
+                data["ruleset"] = {}
         
         # Load diagnostics
         try:
-            with open(os.path.join(RESULTS_DIR, "validation_diagnostics.json"), 'r') as f:
-                data["diagnostics"] = json.load(f)
+            data["diagnostics"] = load_json(VALIDATION_DIAGNOSTICS_FILE)
         except Exception:
             data["diagnostics"] = {}
         
         # Load hidden approvals
         try:
-            with open(os.path.join(APPLICATIONS_DIR, "hidden_approvals.json"), 'r') as f:
-                data["hidden_approvals"] = json.load(f)
+            data["hidden_approvals"] = load_json(HIDDEN_APPROVALS_FILE)
         except Exception:
             data["hidden_approvals"] = {}
             
@@ -242,7 +242,7 @@ Your goal is to discover the exact rules determining credit card approvals.
 
 ## Current Ruleset (Accuracy: Not Perfect)
 ```json
-{json.dumps(current_ruleset, indent=2)}
+{json_dumps(current_ruleset, indent=False)}
 ```
 
 ## CORRECTLY CLASSIFIED EXAMPLES:
@@ -314,16 +314,14 @@ APPLICATION #{app['id']}:
     def extract_ruleset(llm_response, iteration):
         """Extract JSON ruleset from LLM response."""
         # Find JSON object in response
-        json_match = re.search(r'\{[\s\S]*\}', llm_response)
-        if not json_match:
+        extracted_json = find_json_object(llm_response)
+        if extracted_json is None:
             logger.error(f"No JSON found in response: {llm_response[:100]}...")
             raise ValueError("No valid JSON found in LLM response")
         
-        extracted_json = json_match.group(0)
-        
         try:
             # Parse the JSON
-            ruleset = json.loads(extracted_json)
+            ruleset = json_loads(extracted_json)
             
             # Basic validation
             if "rules" not in ruleset or not isinstance(ruleset.get("rules"), list):
@@ -349,12 +347,12 @@ APPLICATION #{app['id']}:
             logger.error(f"Invalid JSON: {extracted_json[:100]}...")
             
             # Try to fix JSON issues
-            fixed_json = re.sub(r'//.*', '', extracted_json)  # Remove comments
-            fixed_json = re.sub(r'([{,])\s*(\w+):', r'\1"\2":', fixed_json)  # Fix keys
+            fixed_json = COMMENT_PATTERN.sub('', extracted_json)  # Remove comments
+            fixed_json = UNQUOTED_KEY_PATTERN.sub(r'\1"\2":', fixed_json)  # Fix keys
             fixed_json = fixed_json.replace("'", "\"")  # Replace single quotes
             
             try:
-                ruleset = json.loads(fixed_json)
+                ruleset = json_loads(fixed_json)
                 ruleset["timestamp"] = int(time.time())
                 ruleset["iteration"] = iteration
                 return ruleset
@@ -363,10 +361,8 @@ APPLICATION #{app['id']}:
     
     def save_ruleset_file(ruleset):
         """Save ruleset to file with verification."""
-        ruleset_file = os.path.join(RESULTS_DIR, "credit_card_approval_rules.json")
-        
-        with open(ruleset_file, 'w') as f:
-            json.dump(ruleset, f, indent=2)
+        with open(RULESET_FILE, 'w') as f:
+            f.write(json_dumps(ruleset))
             f.flush()
             os.fsync(f.fileno())
         
@@ -1,29 +1,35 @@
 from typing import Dict, Any
-import json
 import os
 from datetime import datetime
 from meta_agent_system.core.expert_agent import ExpertAgent
 from meta_agent_system.llm.openai_client import OpenAIClient
 from meta_agent_system.utils.logger import get_logger
+from meta_agent_system.utils.helpers import load_json, save_json, load_applications, get_nested_value
 from meta_agent_system.config.settings import APPLICATIONS_DIR, RESULTS_DIR
 
 logger = get_logger(__name__)
 
-def get_nested_value(obj, path):
-    """Get a value from a nested object using a dot path."""
-    if not path:
-        return None
-    
-    parts = path.split('.')
-    value = obj
-    
-    for part in parts:
-        if isinstance(value, dict) and part in value:
-            value = value[part]
-        else:
-            return None
-    
-    return value
+# Application fields recorded with each evaluation, as diagnostic name -> dot path
+DIAGNOSTIC_FIELDS = {
+    "credit_score": "creditHistory.creditScore",
+    "credit_tier": "creditHistory.creditTier",
+    "payment_history": "creditHistory.paymentHistory",
+    "annual_income": "financialInformation.annualIncome",
+    "income_tier": "financialInformation.incomeTier",
+    "existing_debt": "financialInformation.existingDebt",
+    "debt_ratio": "financialInformation.debtRatio",
+    "debt_tier": "financialInformation.debtTier",
+    "employment_status": "financialInformation.employmentStatus"
+}
+
+# Input and output files, resolved once at import time
+RULESET_FILE = os.path.join(RESULTS_DIR, "credit_card_approval_rules.json")
+HIDDEN_APPROVALS_FILE = os.path.join(APPLICATIONS_DIR, "hidden_approvals.json")
+VALIDATION_RESULTS_FILE = os.path.join(RESULTS_DIR, "validation_results.json")
+VALIDATION_DIAGNOSTICS_FILE = os.path.join(RESULTS_DIR, "validation_diagnostics.json")
+VALIDATION_HISTORY_FILE = os.path.join(RESULTS_DIR, "validation_history.json")
+PERSISTENT_MISCLASSIFICATIONS_FILE = os.path.join(RESULTS_DIR, "persistent_misclassifications.json")
+EDGE_CASES_FILE = os.path.join(RESULTS_DIR, "edge_cases.json")
 
 def evaluate_rule(rule, application):
     """Evaluate a single rule against an application."""
@@ -109,7 +115,7 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
         iteration = task.get("data", {}).get("iteration", 0)
         
         # Load data
-        data = load_validation_data()
+        data = load_validation_data(task.get("data", {}).get("applications"), task.get("data", {}).get("ruleset"))
         applications = data["applications"]
         ruleset = data["ruleset"]
         hidden_approvals = data["hidden_approvals"]
@@ -153,34 +159,19 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
             "previous_accuracy": get_previous_accuracy()
         }
     
-    def load_validation_data():
-        """Load all validation data in one function."""
+    def load_validation_data(applications=None, ruleset=None):
+        """Load all validation data in one function, reusing applications and ruleset if given."""
         data = {}
         
         # Load applications
-        applications = []
-        if os.path.exists(APPLICATIONS_DIR):
-            app_files = [f for f in os.listdir(APPLICATIONS_DIR) 
-                        if f.startswith("application_") and f.endswith(".json")]
-            
-            app_files.sort(key=lambda f: int(f.replace("application_", "").replace(".json", "")))
-            
-            for f in app_files:
-                file_path = os.path.join(APPLICATIONS_DIR, f)
-                try:
-                    with open(file_path, 'r') as file:
-                        applications.append(json.load(file))
-                except Exception as e:
-                    logger.error(f"Error loading application from {file_path}: {str(e)}")
-        
-        data["applications"] = applications
+        data["applications"] = load_applications(APPLICATIONS_DIR, applications)
         
-        # Load ruleset
-        ruleset_file = os.path.join(RESULTS_DIR, "credit_card_approval_rules.json")
-        if os.path.exists(ruleset_file):
+        # Use the caller's ruleset, otherwise load the saved one
+        if ruleset is not None:
+            data["ruleset"] = ruleset
+        elif os.path.exists(RULESET_FILE):
             try:
-                with open(ruleset_file, 'r') as f:
-                    data["ruleset"] = json.load(f)
+                data["ruleset"] = load_json(RULESET_FILE)
             except Exception as e:
                 logger.error(f"Error loading ruleset: {str(e)}")
                 data["ruleset"] = {}
@@ -188,11 +179,9 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
             data["ruleset"] = {}
             
         # Load hidden approvals
-        hidden_approvals_file = os.path.join(APPLICATIONS_DIR, "hidden_approvals.json")
-        if os.path.exists(hidden_approvals_file):
+        if os.path.exists(HIDDEN_APPROVALS_FILE):
             try:
-                with open(hidden_approvals_file, 'r') as f:
-                    data["hidden_approvals"] = json.load(f)
+                data["hidden_approvals"] = load_json(HIDDEN_APPROVALS_FILE)
             except Exception as e:
                 logger.error(f"Error loading hidden approvals: {str(e)}")
                 data["hidden_approvals"] = {}
@@ -209,6 +198,10 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
         declined_count = 0
         misclassified_apps = []
         
+        # The ruleset is the same for every application
+        logic_type = ruleset.get("logic", "all").lower()
+        rules = ruleset.get("rules", [])
+        
         for idx, application in enumerate(applications):
             app_id = idx + 1  # 1-indexed
             key = str(app_id)
@@ -218,8 +211,6 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
                 continue
             
             # Evaluate the ruleset for this application
-            logic_type = ruleset.get("logic", "all").lower()
-            rules = ruleset.get("rules", [])
             rule_results = []
             rule_evaluations = []
             
@@ -277,17 +268,7 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
     
     def extract_app_data(application):
         """Extract key application data for diagnostics."""
-        return {
-            "credit_score": get_nested_value(application, "creditHistory.creditScore"),
-            "credit_tier": get_nested_value(application, "creditHistory.creditTier"),
-            "payment_history": get_nested_value(application, "creditHistory.paymentHistory"),
-            "annual_income": get_nested_value(application, "financialInformation.annualIncome"),
-            "income_tier": get_nested_value(application, "financialInformation.incomeTier"),
-            "existing_debt": get_nested_value(application, "financialInformation.existingDebt"),
-            "debt_ratio": get_nested_value(application, "financialInformation.debtRatio"),
-            "debt_tier": get_nested_value(application, "financialInformation.debtTier"),
-            "employment_status": get_nested_value(application, "financialInformation.employmentStatus")
-        }
+        return {name: get_nested_value(application, path) for name, path in DIAGNOSTIC_FIELDS.items()}
     
     def save_validation_results(ruleset, results, accuracy, iteration):
         """Save all validation results to files."""
@@ -304,17 +285,13 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
             "misclassified_applications": results["misclassified"]
         }
         
-        validation_file = os.path.join(RESULTS_DIR, "validation_results.json")
-        with open(validation_file, 'w') as f:
-            json.dump(validation_results, f, indent=2)
+        save_json(validation_results, VALIDATION_RESULTS_FILE)
         
         # Save detailed diagnostics
-        diagnostics_file = os.path.join(RESULTS_DIR, "validation_diagnostics.json")
-        with open(diagnostics_file, 'w') as f:
-            json.dump({
-                "ruleset": ruleset,
-                "rule_evaluations": results["evaluations"]
-            }, f, indent=2)
+        save_json({
+            "ruleset": ruleset,
+            "rule_evaluations": results["evaluations"]
+        }, VALIDATION_DIAGNOSTICS_FILE)
         
         # Update validation history
         update_validation_history(accuracy, len(ruleset.get("rules", [])), iteration)
@@ -325,13 +302,11 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
     def update_validation_history(accuracy, rule_count, iteration):
         """Update the validation history file."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        history_file = os.path.join(RESULTS_DIR, "validation_history.json")
         validation_history = []
         
-        if os.path.exists(history_file):
+        if os.path.exists(VALIDATION_HISTORY_FILE):
             try:
-                with open(history_file, 'r') as f:
-                    validation_history = json.load(f)
+                validation_history = load_json(VALIDATION_HISTORY_FILE)
             except Exception:
                 pass
 
@@ -342,18 +317,15 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
             "rule_count": rule_count
         })
         
-        with open(history_file, 'w') as f:
-            json.dump(validation_history, f, indent=2)
+        save_json(validation_history, VALIDATION_HISTORY_FILE)
 
     def update_persistent_misclassifications(evaluations, iteration):
         """Track persistently misclassified applications."""
-        file_path = os.path.join(RESULTS_DIR, "persistent_misclassifications.json")
         persistent = {}
         
-        if os.path.exists(file_path):
+        if os.path.exists(PERSISTENT_MISCLASSIFICATIONS_FILE):
             try:
-                with open(file_path, 'r') as f:
-                    persistent = json.load(f)
+                persistent = load_json(PERSISTENT_MISCLASSIFICATIONS_FILE)
             except Exception:
                 pass
         
@@ -373,8 +345,7 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
                     persistent[app_id]["misclassification_count"] += 1
                     persistent[app_id]["iterations"].append(iteration)
         
-        with open(file_path, 'w') as f:
-            json.dump(persistent, f, indent=2)
+        save_json(persistent, PERSISTENT_MISCLASSIFICATIONS_FILE)
     
     def identify_edge_cases(evaluations, ruleset):
         """Identify applications that are edge cases."""
@@ -402,21 +373,17 @@ def create_validator(llm_client: OpenAIClient) -> ExpertAgent:
                         "type": "edge_case_single_rule_fail"
                     })
         
-        edge_case_file = os.path.join(RESULTS_DIR, "edge_cases.json")
-        with open(edge_case_file, 'w') as f:
-            json.dump(edge_cases, f, indent=2)
+        save_json(edge_cases, EDGE_CASES_FILE)
         
         return edge_cases
     
     def get_previous_accuracy():
         """Get the accuracy from previous iteration."""
-        history_file = os.path.join(RESULTS_DIR, "validation_history.json")
-        if os.path.exists(history_file):
+        if os.path.exists(VALIDATION_HISTORY_FILE):
             try:
-                with open(history_file, 'r') as f:
-                    history = json.load(f)
-                    if history and len(history) > 1:
-                        return history[-2].get("accuracy", 0)
+                history = load_json(VALIDATION_HISTORY_FILE)
+                if history and len(history) > 1:
+                    return history[-2].get("accuracy", 0)
             except Exception:
                 pass
         return 0
@@ -1,88 +1,190 @@
 import os
+import sqlite3
+import hashlib
+import threading
 from typing import Dict, Any, Optional
 import json
 from openai import OpenAI
 from datetime import datetime
 from meta_agent_system.utils.logger import get_logger
-from meta_agent_system.config.settings import OPENAI_API_KEY, DEFAULT_MODEL, RESULTS_DIR
+from meta_agent_system.utils.helpers import load_json, json_dumps, JsonObjectScanner, find_json_object
+from meta_agent_system.config.settings import OPENAI_API_KEY, DEFAULT_MODEL, RESULTS_DIR, LLM_CACHE, LLM_MAX_CONCURRENCY, LLM_MAX_RETRIES
 
 logger = get_logger(__name__)
 
+LLM_CACHE_FILE = os.path.join(RESULTS_DIR, ".llm_cache", "responses.sqlite")
+LLM_LOG_FILE = os.path.join(RESULTS_DIR, "llm_interaction_logs.json")
+LLM_TEXT_LOG_FILE = os.path.join(RESULTS_DIR, "llm_interactions.txt")
+
+# generate() reports a failed request as text with this prefix instead of raising
+ERROR_PREFIX = "Error: "
+
+def is_error_response(response: Optional[str]) -> bool:
+    """Check whether a generate() result is a failed request rather than model output"""
+    return response is None or response.startswith(ERROR_PREFIX)
+
 class OpenAIClient:
     """Simple client for OpenAI's models"""
     def __init__(self, model: str = DEFAULT_MODEL, api_key: Optional[str] = None):
         """Initialize OpenAI client."""
         self.model = model
-        self.client = OpenAI(api_key=api_key or OPENAI_API_KEY)
+        # The SDK retries 429 and 5xx responses with exponential backoff
+        self.client = OpenAI(api_key=api_key or OPENAI_API_KEY, max_retries=LLM_MAX_RETRIES)
         if not api_key and not OPENAI_API_KEY:
             raise ValueError("OpenAI API key must be provided or set as OPENAI_API_KEY environment variable")
         logger.info(f"Initialized OpenAI client with model: {model}")
         
         # Create LLM logs directory
-        self.logs_file = os.path.join(RESULTS_DIR, "llm_interaction_logs.json")
+        self.logs_file = LLM_LOG_FILE
+        # Serializes log writes when requests are issued from several threads
+        self._log_lock = threading.Lock()
         self.init_logs_file()
         
+        # Experts and rationale batches call in from thread pools; cap the requests
+        # in flight so concurrent callers stay within the account's rate limits
+        self._request_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+        
+        # Optional cache of earlier responses, shared by all threads
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        if LLM_CACHE:
+            self.init_cache()
+        
     def init_logs_file(self):
         """Initialize the logs file if it doesn't exist"""
         if not os.path.exists(self.logs_file):
             with open(self.logs_file, 'w') as f:
                 json.dump([], f)
     
-    def log_interaction(self, expert_name: str, prompt: str, response: str, metadata: Dict[str, Any] = None):
+    def init_cache(self):
+        """Open the response cache, creating it if it doesn't exist"""
+        try:
+            os.makedirs(os.path.dirname(LLM_CACHE_FILE), exist_ok=True)
+            self._cache = sqlite3.connect(LLM_CACHE_FILE, check_same_thread=False)
+            self._cache.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT)")
+            self._cache.commit()
+            logger.info(f"Using LLM response cache: {LLM_CACHE_FILE}")
+        except Exception as e:
+            logger.warning(f"Could not open LLM response cache: {str(e)}")
+            self._cache = None
+    
+    def cache_key(self, prompt: str, system_message: str, temperature: float, max_tokens: int,
+                  extra: Optional[Dict[str, Any]] = None, model: Optional[str] = None,
+                  response_format: Optional[Dict[str, Any]] = None, stop_after_json: bool = False) -> str:
+        """Hash a request, ignoring differences in whitespace between words"""
+        request = json.dumps({
+            "model": model or self.model,
+            "system_message": " ".join(system_message.split()),
+            "prompt": " ".join(prompt.split()),
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": response_format,
+            "stop_after_json": stop_after_json,
+            "extra": extra or {}
+        }, sort_keys=True)
+        return hashlib.blake2b(request.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def cached_response(self, key: str) -> Optional[str]:
+        """Get the cached response for key, if any"""
+        with self._cache_lock:
+            row = self._cache.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def cache_response(self, key: str, response: str):
+        """Store a response in the cache"""
+        with self._cache_lock:
+            self._cache.execute("INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response))
+            self._cache.commit()
+    
+    def log_interaction(self, expert_name: str, prompt: str, response: str, metadata: Dict[str, Any] = None,
+                        model: Optional[str] = None):
         """Log an interaction with the LLM"""
         # Create log entry
         log_entry = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "expert": expert_name,
-            "model": self.model,
+            "model": model or self.model,
             "prompt": prompt,
             "response": response,
             "metadata": metadata or {}
         }
         
-        # Read existing logs
-        try:
-            with open(self.logs_file, 'r') as f:
-                logs = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            logs = []
-        
-        # Append new log and save
-        logs.append(log_entry)
-        with open(self.logs_file, 'w') as f:
-            json.dump(logs, f, indent=2)
+        with self._log_lock:
+            # Read existing logs
+            try:
+                logs = load_json(self.logs_file)
+            except (ValueError, FileNotFoundError):
+                logs = []
             
-        # Also create/append to human-readable text log
-        text_log_file = os.path.join(RESULTS_DIR, "llm_interactions.txt")
-        with open(text_log_file, 'a') as f:
-            f.write(f"\n{'='*80}\n")
-            f.write(f"TIMESTAMP: {log_entry['timestamp']}\n")
-            f.write(f"EXPERT: {expert_name}\n")
-            f.write(f"MODEL: {self.model}\n")
-            f.write(f"\n--- PROMPT ---\n")
-            f.write(f"{prompt}\n")
-            f.write(f"\n--- RESPONSE ---\n")
-            f.write(f"{response}\n")
-            f.write(f"\n{'='*80}\n")
+            # Append new log and save
+            logs.append(log_entry)
+            with open(self.logs_file, 'w') as f:
+                # Compact: the readable copy is llm_interactions.txt
+                f.write(json_dumps(logs, indent=False))
+                
+            # Also create/append to human-readable text log
+            with open(LLM_TEXT_LOG_FILE, 'a') as f:
+                f.write(f"\n{'='*80}\n")
+                f.write(f"TIMESTAMP: {log_entry['timestamp']}\n")
+                f.write(f"EXPERT: {expert_name}\n")
+                f.write(f"MODEL: {log_entry['model']}\n")
+                f.write(f"\n--- PROMPT ---\n")
+                f.write(f"{prompt}\n")
+                f.write(f"\n--- RESPONSE ---\n")
+                f.write(f"{response}\n")
+                f.write(f"\n{'='*80}\n")
         
     def generate(self, prompt: str, expert_name: str = "Unknown", **kwargs) -> str:
         """Generate text using OpenAI's API."""
         temperature = kwargs.get("temperature", 0.7)
         max_tokens = kwargs.get("max_tokens", 1000)
         system_message = kwargs.get("system_message", "You are a helpful assistant.")
+        # Experts with simpler tasks can route to a cheaper model
+        model = kwargs.get("model") or self.model
+        # Callers that need a fresh response each time pass use_cache=False; callers
+        # that want distinct responses per step pass the step in cache_key_extra
+        use_cache = self._cache is not None and kwargs.get("use_cache", True)
+        # Callers that only parse the first JSON object pass stop_after_json=True
+        stop_after_json = kwargs.get("stop_after_json", False)
+        
+        # Answer from the cache when the same request was made before
+        if use_cache:
+            key = self.cache_key(prompt, system_message, temperature, max_tokens, kwargs.get("cache_key_extra"), model,
+                                 kwargs.get("response_format"), stop_after_json)
+            cached = self.cached_response(key)
+            if cached is not None:
+                logger.debug(f"Using cached response for {expert_name}")
+                return cached
+        
+        request = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        # Callers that want a bare JSON object pass response_format={"type": "json_object"}
+        if kwargs.get("response_format"):
+            request["response_format"] = kwargs["response_format"]
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
+            with self._request_slots:
+                if stop_after_json:
+                    response_text, usage = self.stream_until_json(request)
+                else:
+                    response = self.client.chat.completions.create(**request)
+                    
+                    response_text = response.choices[0].message.content
+                    usage = response.usage.model_dump() if hasattr(response, "usage") and response.usage else {}
             
-            response_text = response.choices[0].message.content
+            # Don't keep a stopped-early response whose JSON object never closed; later runs would replay it
+            if use_cache and response_text is not None:
+                if stop_after_json and find_json_object(response_text) is None:
+                    logger.debug(f"Not caching incomplete JSON response for {expert_name}")
+                else:
+                    self.cache_response(key, response_text)
             
             # Log the interaction
             self.log_interaction(
@@ -93,13 +195,15 @@ class OpenAIClient:
                     "system_message": system_message,
                     "temperature": temperature,
                     "max_tokens": max_tokens,
-                    "usage": response.usage.model_dump() if hasattr(response, "usage") else {}
-                }
+                    "response_format": kwargs.get("response_format"),
+                    "usage": usage
+                },
+                model=model
             )
             
             return response_text
         except Exception as e:
-            error_msg = f"Error: {str(e)}"
+            error_msg = f"{ERROR_PREFIX}{str(e)}"
             logger.error(f"Error generating text: {error_msg}")
             
             # Log the failed interaction
@@ -111,33 +215,68 @@ class OpenAIClient:
                     "error": True,
                     "system_message": system_message,
                     "temperature": temperature
-                }
+                },
+                model=model
             )
             
             return error_msg
     
+    def stream_until_json(self, request: Dict[str, Any]):
+        """
+        Stream a response and stop as soon as its first JSON object is complete,
+        so trailing explanation isn't generated. Returns (text, usage); usage is
+        only reported when the model finishes on its own.
+        """
+        stream = self.client.chat.completions.create(**request, stream=True, stream_options={"include_usage": True})
+        
+        scanner = JsonObjectScanner()
+        parts = []
+        usage = {}
+        try:
+            for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage.model_dump()
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                
+                content = chunk.choices[0].delta.content
+                parts.append(content)
+                if scanner.feed(content) is not None:
+                    usage["stopped_after_json"] = True
+                    break
+        finally:
+            # Closing the stream cancels the rest of the generation; the text received
+            # so far is still usable if the connection can't be closed cleanly
+            try:
+                stream.close()
+            except Exception as e:
+                logger.warning(f"Could not close response stream: {str(e)}")
+        
+        return "".join(parts), usage
+    
     def structured_generate(self, prompt: str, output_schema: Dict[str, Any], expert_name: str = "Unknown", **kwargs) -> Dict[str, Any]:
         """Generate structured output using OpenAI's function calling."""
         temperature = kwargs.get("temperature", 0.7)
         system_message = kwargs.get("system_message", "You are a helpful assistant.")
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": prompt}
-                ],
-                functions=[
-                    {
-                        "name": "generate_structured_output",
-                        "description": "Generate structured output based on the user's request",
-                        "parameters": output_schema
-                    }
-                ],
-                function_call={"name": "generate_structured_output"},
-                temperature=temperature
-            )
+            with self._request_slots:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_message},
+                        {"role": "user", "content": prompt}
+                    ],
+                    functions=[
+                        {
+                            "name": "generate_structured_output",
+                            "description": "Generate structured output based on the user's request",
+                            "parameters": output_schema
+                        }
+                    ],
+                    function_call={"name": "generate_structured_output"},
+                    temperature=temperature
+                )
             
             function_call = response.choices[0].message.function_call
             
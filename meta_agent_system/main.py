@@ -5,7 +5,7 @@ import time
 import argparse
 from dotenv import load_dotenv
 from meta_agent_system.utils.logger import get_logger
-from meta_agent_system.utils.helpers import save_json, get_timestamp, ensure_directory_exists
+from meta_agent_system.utils.helpers import load_json, save_json, load_application_records, get_timestamp, ensure_directory_exists, find_json_object
 from meta_agent_system.llm.openai_client import OpenAIClient
 from meta_agent_system.config.settings import RESULTS_DIR, APPLICATIONS_DIR
 from meta_agent_system.experts.validator import create_validator
@@ -13,7 +13,6 @@ from meta_agent_system.experts.rule_analyzer import create_rule_analyzer
 from meta_agent_system.experts.rule_refiner import create_rule_refiner
 from meta_agent_system.utils.visualization_helper import generate_accuracy_visualization
 from meta_agent_system.experts.expertise_recommender import create_expertise_recommender
-import matplotlib.pyplot as plt
 from datetime import datetime
 from meta_agent_system.experts.misclassification_analyzer import analyze_misclassifications
 from meta_agent_system.core.summary_generator import generate_summary
@@ -28,6 +27,10 @@ init()
 # Configure logging
 logger = get_logger(__name__)
 
+# Keys and string values in pretty-printed JSON, highlighted line by line
+JSON_KEY_PATTERN = re.compile(r'(".*?"):')
+JSON_STRING_VALUE_PATTERN = re.compile(r': (".*?")(,?)')
+
 def get_initial_ruleset_from_scratch(openai_client):
     """Generate a minimal ruleset from scratch with minimal accuracy"""
     print("Generating minimal ruleset from scratch...")
@@ -121,10 +124,10 @@ def main():
     
     # Save initial ruleset
     ruleset_file = os.path.join(RESULTS_DIR, "credit_card_approval_rules.json")
-    with open(ruleset_file, 'w') as f:
-        json.dump(initial_ruleset, f, indent=2)
+    save_json(initial_ruleset, ruleset_file)
     
-    # Track progress
+    # Track progress; current_ruleset always matches the saved ruleset file
+    current_ruleset = initial_ruleset
     current_accuracy = 0
     best_accuracy = 0
     best_ruleset = initial_ruleset
@@ -132,6 +135,9 @@ def main():
     max_iterations = args.max_iterations
     iteration = 0
     
+    # Applications don't change during a run, so load them once for every expert
+    applications = [app for _, app in load_application_records(APPLICATIONS_DIR)]
+    
     print(f"\nStarting rule discovery process (max {max_iterations} iterations)...\n")
     
     # Main iteration loop
@@ -143,7 +149,7 @@ def main():
         print("Validating current ruleset...")
         validation_result = validator.execute({
             "description": "Validate credit card approval rules",
-            "data": {"iteration": iteration}
+            "data": {"iteration": iteration, "applications": applications, "ruleset": current_ruleset}
         })
         
         current_accuracy = validation_result.get("accuracy", 0)
@@ -155,12 +161,10 @@ def main():
             best_iteration = iteration
             
             # Save best ruleset
-            with open(ruleset_file, 'r') as f:
-                best_ruleset = json.load(f)
+            best_ruleset = current_ruleset
             
             best_ruleset_file = os.path.join(RESULTS_DIR, f"best_ruleset_iteration_{iteration}.json")
-            with open(best_ruleset_file, 'w') as f:
-                json.dump(best_ruleset, f, indent=2)
+            save_json(best_ruleset, best_ruleset_file)
                 
             print(f"New best accuracy: {best_accuracy:.2f}%")
         
@@ -174,6 +178,7 @@ def main():
                 "description": "Identify needed expertise based on validation results",
                 "data": {
                     "validation_result": validation_result,
+                    "ruleset": current_ruleset,
                     "iteration": iteration,
                     "current_accuracy": current_accuracy
                 }
@@ -219,17 +224,9 @@ def main():
                                 prefix = system_prompt[:json_start + brace_start]
                                 json_text = json_text[brace_start:]
                                 
-                                # Find matching closing brace
-                                brace_count = 0
-                                for i, char in enumerate(json_text):
-                                    if char == '{':
-                                        brace_count += 1
-                                    elif char == '}':
-                                        brace_count -= 1
-                                        if brace_count == 0:
-                                            json_str = json_text[:i+1]
-                                            suffix = json_text[i+1:]
-                                            break
+                                # Find matching closing brace, ignoring braces inside strings
+                                json_str = find_json_object(json_text) or json_text
+                                suffix = json_text[len(json_str):]
                                 
                                 # Format the parts
                                 if prefix.strip():
@@ -249,9 +246,9 @@ def main():
                                     for line in pretty_json.split('\n'):
                                         indented_line = "    " + line
                                         # Highlight keys in cyan
-                                        highlighted = re.sub(r'(".*?"):', f"{Fore.CYAN}\\1{Fore.RESET}:", indented_line)
+                                        highlighted = JSON_KEY_PATTERN.sub(f"{Fore.CYAN}\\1{Fore.RESET}:", indented_line)
                                         # Highlight values in white
-                                        highlighted = re.sub(r': (".*?")(,?)', f": {Fore.WHITE}\\1{Fore.RESET}\\2", highlighted)
+                                        highlighted = JSON_STRING_VALUE_PATTERN.sub(f": {Fore.WHITE}\\1{Fore.RESET}\\2", highlighted)
                                         print(highlighted)
                                     print()
                                 except json.JSONDecodeError:
@@ -283,17 +280,9 @@ def main():
                                                initial_indent="  ", subsequent_indent="  ")
                             print(f"{Fore.WHITE}{wrapped_prefix}{Style.RESET_ALL}")
                         
-                        # Find end of JSON
-                        brace_count = 0
-                        for i, char in enumerate(json_text):
-                            if char == '{':
-                                brace_count += 1
-                            elif char == '}':
-                                brace_count -= 1
-                                if brace_count == 0:
-                                    json_str = json_text[:i+1]
-                                    suffix = json_text[i+1:]
-                                    break
+                        # Find end of JSON, ignoring braces inside strings
+                        json_str = find_json_object(json_text) or json_text
+                        suffix = json_text[len(json_str):]
                         
                         # Try to parse and pretty-print the JSON
                         try:
@@ -305,9 +294,9 @@ def main():
                             for line in pretty_json.split('\n'):
                                 indented_line = "    " + line
                                 # Highlight keys in cyan
-                                highlighted = re.sub(r'(".*?"):', f"{Fore.CYAN}\\1{Fore.RESET}:", indented_line)
+                                highlighted = JSON_KEY_PATTERN.sub(f"{Fore.CYAN}\\1{Fore.RESET}:", indented_line)
                                 # Highlight values in white
-                                highlighted = re.sub(r': (".*?")(,?)', f": {Fore.WHITE}\\1{Fore.RESET}\\2", highlighted)
+                                highlighted = JSON_STRING_VALUE_PATTERN.sub(f": {Fore.WHITE}\\1{Fore.RESET}\\2", highlighted)
                                 print(highlighted)
                             print()
                         except json.JSONDecodeError:
@@ -339,17 +328,13 @@ def main():
         print("Analyzing application patterns...")
         rule_analyzer.execute({
             "description": "Analyze credit card applications for patterns",
-            "data": {"iteration": iteration}
+            "data": {"iteration": iteration, "applications": applications}
         })
         
         # Step 2.5: Gather expert insights
         expert_insights = []
         if iteration > 1:  # Only use dynamic experts after they've been created
             print("Gathering specialized insights from domain experts...")
-            current_ruleset = {}
-            with open(ruleset_file, 'r') as f:
-                current_ruleset = json.load(f)
-            
             expert_insights = expert_manager.gather_expert_insights(
                 iteration=iteration,
                 current_ruleset=current_ruleset,
@@ -367,12 +352,16 @@ def main():
             "description": "Refine credit card approval rules",
             "data": {
                 "iteration": iteration,
-                "expert_insights": expert_insights
+                "expert_insights": expert_insights,
+                "applications": applications,
+                "ruleset": current_ruleset
             }
         })
         
         # Report on new ruleset
         ruleset = refinement_result.get("ruleset", {})
+        # The refiner saved this ruleset; keep it rather than reading the file back
+        current_ruleset = ruleset or load_json(ruleset_file)
         nested_rule_count = sum(1 for rule in ruleset.get("rules", []) 
                                if isinstance(rule, dict) and "rules" in rule)
         
@@ -409,8 +398,7 @@ def main():
     
     # Use best ruleset if better than final
     if best_accuracy > current_accuracy:
-        with open(ruleset_file, 'w') as f:
-            json.dump(best_ruleset, f, indent=2)
+        save_json(best_ruleset, ruleset_file)
         print(f"Restored best ruleset from iteration {best_iteration}")
     
     final_ruleset = best_ruleset if best_accuracy > current_accuracy else ruleset
@@ -462,18 +450,20 @@ def explore_applications():
         print("Applications directory not found.")
         return
     
-    application_files = [f for f in os.listdir(APPLICATIONS_DIR) 
-                        if f.startswith("application_") and f.endswith(".json")]
+    try:
+        applications = load_application_records(APPLICATIONS_DIR)
+    except Exception as e:
+        print(f"Error loading applications: {str(e)}")
+        applications = []
     
-    print(f"Found {len(application_files)} applications.")
+    print(f"Found {len(applications)} applications.")
     
     # Load hidden approvals
     hidden_approvals = {}
     hidden_approvals_file = os.path.join(APPLICATIONS_DIR, "hidden_approvals.json")
     if os.path.exists(hidden_approvals_file):
         try:
-            with open(hidden_approvals_file, 'r') as f:
-                hidden_approvals = json.load(f)
+            hidden_approvals = load_json(hidden_approvals_file)
         except Exception as e:
             print(f"Error loading hidden approvals: {str(e)}")
     
@@ -484,16 +474,10 @@ def explore_applications():
     print(f"Applications: {approved_count} approved, {declined_count} declined")
     
     # Print first application as example
-    if application_files:
-        sample_file = os.path.join(APPLICATIONS_DIR, application_files[0])
-        try:
-            with open(sample_file, 'r') as f:
-                sample_app = json.load(f)
-            
-            print("\nSample application structure:")
-            print(json.dumps(sample_app, indent=2))
-        except Exception as e:
-            print(f"Error loading sample application: {str(e)}")
+    if applications:
+        _, sample_app = applications[0]
+        print("\nSample application structure:")
+        print(json.dumps(sample_app, indent=2))
 
 if __name__ == "__main__":
     main()
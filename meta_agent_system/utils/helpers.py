@@ -1,27 +1,183 @@
 import os
+import re
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from meta_agent_system.utils.logger import get_logger
+
+# orjson is an optional speedup; fall back to the standard library if it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = get_logger(__name__)
+
+# All applications in one file, line N holding application N; see data_generation.py
+APPLICATIONS_JSONL = "applications.jsonl"
+APPLICATION_FILE_PATTERN = re.compile(r'application_(\d+)\.json')
+APPLICATION_LOAD_WORKERS = 8
 
 def ensure_directory_exists(directory_path: str):
     """Create directory if it doesn't exist"""
     if not os.path.exists(directory_path):
         os.makedirs(directory_path)
 
-def save_json(data: Dict[str, Any], filepath: str):
-    """Save data as JSON to a file"""
+def json_loads(data) -> Any:
+    """Parse JSON from a str or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(data: Any, indent: bool = True) -> str:
+    """Serialize data to a JSON string (two-space indent by default), using orjson when available"""
+    if orjson is not None:
+        # Non-string keys are stringified, as the standard library does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option).decode("utf-8")
+    return json.dumps(data, indent=2 if indent else None)
+
+def save_json(data: Dict[str, Any], filepath: str, indent: bool = True):
+    """Save data as JSON to a file; pass indent=False for files only the pipeline reads"""
     # Ensure directory exists
     directory = os.path.dirname(filepath)
     ensure_directory_exists(directory)
     
     # Save data
     with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
+        f.write(json_dumps(data, indent=indent))
 
 def load_json(filepath: str) -> Dict[str, Any]:
     """Load JSON data from a file"""
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    with open(filepath, 'rb') as f:
+        return json_loads(f.read())
+
+def load_jsonl(filepath: str) -> List[Any]:
+    """Load a JSON Lines file, one JSON value per non-empty line"""
+    with open(filepath, 'rb') as f:
+        return [json_loads(line) for line in f if line.strip()]
+
+def load_application_records(applications_dir: str) -> List[Tuple[int, Dict[str, Any]]]:
+    """Return (id, application) pairs in ID order, preferring the single applications.jsonl file"""
+    jsonl_file = os.path.join(applications_dir, APPLICATIONS_JSONL)
+    if os.path.exists(jsonl_file):
+        return list(enumerate(load_jsonl(jsonl_file), start=1))
+    
+    if not os.path.exists(applications_dir):
+        return []
+    
+    # Fall back to the individual application_N.json files
+    app_files = []
+    with os.scandir(applications_dir) as entries:
+        for entry in entries:
+            # Match the name and capture the numeric ID in one step
+            match = APPLICATION_FILE_PATTERN.fullmatch(entry.name)
+            if match:
+                app_files.append((int(match.group(1)), entry.path))
+    
+    app_files.sort(key=lambda item: item[0])
+    
+    def load_application(file_path):
+        """Load a single application file, or None if it can't be read"""
+        try:
+            return load_json(file_path)
+        except Exception as e:
+            logger.error(f"Error loading application from {file_path}: {str(e)}")
+            return None
+    
+    # Read and parse the files concurrently so their I/O overlaps
+    with ThreadPoolExecutor(max_workers=APPLICATION_LOAD_WORKERS) as executor:
+        app_data_list = list(executor.map(load_application, [file_path for _, file_path in app_files]))
+    
+    return [(app_id, app_data) for (app_id, _), app_data in zip(app_files, app_data_list) if app_data is not None]
+
+def load_applications(applications_dir: str, applications: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Return the applications a caller already loaded, or load them from applications_dir in ID order"""
+    if applications is not None:
+        return applications
+    
+    try:
+        return [app for _, app in load_application_records(applications_dir)]
+    except Exception as e:
+        logger.error(f"Error loading applications: {str(e)}")
+        return []
+
+@lru_cache(maxsize=None)
+def split_path(path: str) -> Tuple[str, ...]:
+    """Split a dot path into its keys; the same few paths are looked up for every application"""
+    return tuple(path.split('.'))
+
+def get_nested_value(obj: Any, path: str) -> Any:
+    """Get a value from a nested object using a dot path."""
+    if not path:
+        return None
+    
+    value = obj
+    
+    for part in split_path(path):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return None
+    
+    return value
+
+class JsonObjectScanner:
+    """
+    Find the first balanced {...} span in text that arrives in pieces, skipping
+    braces inside strings, so a streamed response can be stopped once it is complete
+    """
+    
+    def __init__(self):
+        self.text = ""
+        self.start = -1
+        self.position = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.result = None
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """Scan the next piece of text; returns the object once its closing brace is seen"""
+        if self.result is not None:
+            return self.result
+        
+        self.text += chunk
+        if self.start < 0:
+            self.start = self.text.find('{')
+            if self.start < 0:
+                return None
+            self.position = self.start
+        
+        # Resume the single pass where the previous piece left off
+        text = self.text
+        for i in range(self.position, len(text)):
+            char = text[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                self.depth += 1
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.result = text[self.start:i + 1]
+                    return self.result
+        
+        self.position = len(text)
+        return None
+
+def find_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} span in text, skipping braces inside strings, or None"""
+    return JsonObjectScanner().feed(text)
 
 def format_time(seconds: float) -> str:
     """Format time in seconds to a readable string"""
@@ -1,29 +1,13 @@
 import os
-import json
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 from meta_agent_system.config.settings import RESULTS_DIR
 from meta_agent_system.utils.logger import get_logger
+from meta_agent_system.utils.helpers import load_json, get_nested_value
 
 logger = get_logger(__name__)
 
-def get_nested_value(obj, path):
-    """Get a value from a nested object using a dot path."""
-    if not path:
-        return None
-    
-    parts = path.split('.')
-    value = obj
-    
-    for part in parts:
-        if isinstance(value, dict) and part in value:
-            value = value[part]
-        else:
-            return None
-    
-    return value
-
 def generate_accuracy_visualization():
     """Generate a simple visualization of accuracy improvement over iterations."""
     history_file = os.path.join(RESULTS_DIR, "validation_history.json")
@@ -31,8 +15,7 @@ def generate_accuracy_visualization():
         return None
     
     # Load validation history
-    with open(history_file, 'r') as f:
-        validation_history = json.load(f)
+    validation_history = load_json(history_file)
     
     if not validation_history:
         return None
@@ -5,12 +5,12 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=[
-        "openai>=1.0.0",
+        "openai>=1.26.0",
         "python-dotenv>=0.19.0",
         "pandas>=1.3.0",
         "matplotlib>=3.4.0",
-        "pydantic>=2.0.0",
-        "psutil>=5.9.0"
+        "psutil>=5.9.0",
+        "numpy>=1.20.0"
     ],
     author="Meta Agent Team",
     description="A framework for solving complex problems using a meta-agent approach",